@@ -0,0 +1,227 @@
+"""
+End-to-end client benchmark against a local mock fare server, so that no queries reach Ryanair.
+
+    python -m benchmarks.bench_client [--queries 200] [--fares 100] [--latency 0.02] [--error-rate 0]
+                                      [--output results.json] [--compare baseline.json]
+
+Each mode makes `--queries` distinct queries, so that none are coalesced, and reports queries/sec, p50/p99 query
+latency, parse cost per fare and peak traced memory, along with how many queries failed and how many of those were
+given up on after retrying. Saving results with `--output` and passing them back with
+`--compare` on a later run prints the change in each measurement.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from benchmarks.mock_server import MockFareServer
+from ryanair import Ryanair, AsyncRyanair
+from ryanair.metrics import Metrics
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class _LatencyMetrics(Metrics):
+    """
+    Keeps every latency and parse time, rather than histogram buckets, so that exact percentiles can be reported.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.parse_seconds = 0.0
+        self.parsed_items = 0
+        self.give_ups = 0
+        self._lock = threading.Lock()
+
+    def on_request(self, endpoint, seconds, num_bytes, status):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def on_give_up(self, endpoint, tries, exception):
+        if tries > 1:
+            with self._lock:
+                self.give_ups += 1
+
+    def on_parse(self, endpoint, seconds, num_items):
+        with self._lock:
+            self.parse_seconds += seconds
+            self.parsed_items += num_items
+
+
+def _queries(num_queries: int):
+    """
+    Distinct (airport, date) pairs, so that no two queries are coalesced.
+    """
+    start = date(2024, 1, 1)
+    return [
+        (f"A{i % 100:02d}", (start + timedelta(days=i // 100)).isoformat())
+        for i in range(num_queries)
+    ]
+
+
+def _query(ryanair: Ryanair, airport: str, day: str) -> bool:
+    """
+    Returns whether the query failed, so that one failure doesn't end the run.
+    """
+    try:
+        ryanair.get_cheapest_flights(airport, day, day)
+    except Exception:
+        return True
+    return False
+
+
+def run_sequential(ryanair: Ryanair, queries) -> int:
+    return sum(_query(ryanair, airport, day) for airport, day in queries)
+
+
+def run_threaded(ryanair: Ryanair, queries) -> int:
+    with ThreadPoolExecutor(max_workers=ryanair.max_workers) as executor:
+        return sum(executor.map(lambda query: _query(ryanair, *query), queries))
+
+
+async def run_async(ryanair, queries) -> int:
+    async def query(airport, day):
+        try:
+            await ryanair.get_cheapest_flights(airport, day, day)
+        except Exception:
+            return True
+        return False
+
+    # AsyncRyanair bounds how many of these are in flight at once
+    return sum(await asyncio.gather(*(query(*q) for q in queries)))
+
+
+def _measure(server: MockFareServer, mode: str, num_queries: int):
+    queries = _queries(num_queries)
+    metrics = _LatencyMetrics()
+
+    with server.patch_clients():
+        if mode == "async":
+
+            async def run():
+                async with AsyncRyanair(metrics=metrics) as ryanair:
+                    return await run_async(ryanair, queries), ryanair.num_queries
+
+            start = time.perf_counter()
+            failed, num_made = asyncio.run(run())
+        else:
+            ryanair = Ryanair(metrics=metrics)
+            start = time.perf_counter()
+            if mode == "sequential":
+                failed = run_sequential(ryanair, queries)
+            else:
+                failed = run_threaded(ryanair, queries)
+            num_made = ryanair.num_queries
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(metrics.latencies) or [0.0]
+    return {
+        "queries": num_made,
+        "queries_per_sec": num_made / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "parse_us_per_fare": metrics.parse_seconds / max(metrics.parsed_items, 1) * 1e6,
+        "failed": failed,
+        "give_ups": metrics.give_ups,
+    }
+
+
+def _measure_peak_memory(server: MockFareServer, mode: str, num_queries: int):
+    # Traced separately, since tracing slows everything else down
+    tracemalloc.start()
+    try:
+        _measure(server, mode, num_queries)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--fares", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with results saved by --output")
+    args = parser.parse_args()
+    # Retries of the mock server's errors would otherwise swamp the results
+    logging.getLogger("ryanair").setLevel(logging.WARNING)
+
+    modes = ["sequential", "threaded"]
+    if httpx is not None:
+        modes.append("async")
+
+    results = {
+        "config": {
+            "queries": args.queries,
+            "fares": args.fares,
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "python": platform.python_version(),
+        },
+        "modes": {},
+    }
+    with MockFareServer(
+        num_fares=args.fares, latency=args.latency, error_rate=args.error_rate
+    ) as server:
+        for mode in modes:
+            measured = _measure(server, mode, args.queries)
+            measured["peak_memory_mb"] = _measure_peak_memory(
+                server, mode, args.queries
+            )
+            results["modes"][mode] = measured
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["modes"]
+
+    print(
+        f"{'mode':<12} {'queries/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'us/fare':>8} {'peak MB':>8} "
+        f"{'failed':>8} {'give-ups':>8}"
+    )
+    for mode, measured in results["modes"].items():
+        print(
+            f"{mode:<12} {measured['queries_per_sec']:10.1f} {measured['p50_ms']:8.2f} "
+            f"{measured['p99_ms']:8.2f} {measured['parse_us_per_fare']:8.2f} {measured['peak_memory_mb']:8.2f} "
+            f"{measured['failed']:8d} {measured['give_ups']:8d}"
+        )
+        if mode in baseline:
+            print(
+                f"{'  vs saved':<12}"
+                + "".join(
+                    f" {_change(measured[key], baseline[mode][key]):>{width}}"
+                    for key, width in (
+                        ("queries_per_sec", 10),
+                        ("p50_ms", 8),
+                        ("p99_ms", 8),
+                        ("parse_us_per_fare", 8),
+                        ("peak_memory_mb", 8),
+                    )
+                )
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def _change(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous:+.0%}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark comparing the original response parsing with the current fast path.
+
+    python -m benchmarks.bench_parse [--fares 5000] [--repeat 20]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from benchmarks.mock_server import make_one_way_fares
+from ryanair.ryanair import _BaseRyanair
+from ryanair.types import Flight
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE
+
+
+def make_response(num_fares: int) -> bytes:
+    return json.dumps(
+        {**MOCKED_ONE_WAY_RESPONSE, "fares": make_one_way_fares(num_fares)}
+    ).encode()
+
+
+class _Response:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def parse_original(content: bytes):
+    """
+    The parsing path as it was before the fast path was added.
+    """
+    flights = []
+    for fare in json.loads(content)["fares"]:
+        flight = fare["outbound"]
+        flights.append(
+            Flight(
+                origin=flight["departureAirport"]["iataCode"],
+                originFull=", ".join(
+                    (
+                        flight["departureAirport"]["name"],
+                        flight["departureAirport"]["countryName"],
+                    )
+                ),
+                destination=flight["arrivalAirport"]["iataCode"],
+                destinationFull=", ".join(
+                    (
+                        flight["arrivalAirport"]["name"],
+                        flight["arrivalAirport"]["countryName"],
+                    )
+                ),
+                departureTime=datetime.fromisoformat(flight["departureDate"]),
+                flightNumber=f"{flight['flightNumber'][:2]} {flight['flightNumber'][2:]}",
+                price=flight["price"]["value"],
+                currency=flight["price"]["currencyCode"],
+            )
+        )
+    return flights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fares", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    content = make_response(args.fares)
+    client = _BaseRyanair()
+
+    def parse_fast():
+        fares = _BaseRyanair._parse_json(_Response(content))["fares"]
+        return client._parse_cheapest_flights(fares)
+
+    def parse_fast_filtered():
+        fares = _BaseRyanair._parse_json(_Response(content))["fares"]
+        return client._parse_cheapest_flights(
+            fares, predicate=lambda fare: fare.price < 20
+        )
+
+    assert parse_fast() == parse_original(content)
+
+    for name, fn in (
+        ("original", lambda: parse_original(content)),
+        ("fast", parse_fast),
+        ("fast, 5% kept by predicate", parse_fast_filtered),
+    ):
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(
+            f"{name:<28} {best * 1000:8.2f} ms/response "
+            f"{best / args.fares * 1e6:6.2f} us/fare"
+        )
+
+
+if __name__ == "__main__":
+    main()
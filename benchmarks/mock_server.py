@@ -0,0 +1,221 @@
+"""
+A local stand-in for the Ryanair fare API, so that the client can be benchmarked (and stress tested) offline.
+
+    with MockFareServer(num_fares=500, latency=0.02) as server:
+        with server.patch_clients():
+            ryanair = Ryanair()
+            ...
+"""
+import copy
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from unittest.mock import patch
+from urllib.parse import urlsplit, parse_qs
+
+from ryanair.AsyncSessionManager import AsyncSessionManager
+from ryanair.SessionManager import BaseSessionManager
+from ryanair.ryanair import _BaseRyanair
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+API_PATH = "/farfnd/v4/"
+
+
+def make_one_way_fares(num_fares: int, origin: str = "DUB") -> list:
+    """
+    Scale up a recorded `oneWayFares` response to `num_fares` fares from `origin`, over a few hundred routes.
+    """
+    template = MOCKED_ONE_WAY_RESPONSE["fares"][0]
+    fares = []
+    for i in range(num_fares):
+        fare = copy.deepcopy(template)
+        _vary_flight(fare["outbound"], i, origin)
+        fares.append(fare)
+    return fares
+
+
+def make_return_fares(num_fares: int, origin: str = "DUB") -> list:
+    """
+    As `make_one_way_fares`, for a `roundTripFares` response.
+    """
+    template = MOCKED_RETURN_RESPONSE["fares"][0]
+    fares = []
+    for i in range(num_fares):
+        fare = copy.deepcopy(template)
+        _vary_flight(fare["outbound"], i, origin)
+        _vary_flight(fare["inbound"], i, origin, inbound=True)
+        fares.append(fare)
+    return fares
+
+
+def _vary_flight(flight: dict, i: int, origin: str, inbound: bool = False):
+    home, away = (
+        (flight["arrivalAirport"], flight["departureAirport"])
+        if inbound
+        else (flight["departureAirport"], flight["arrivalAirport"])
+    )
+    home["iataCode"] = origin
+    away["iataCode"] = f"A{i % 300:02d}"
+    away["name"] = f"Airport {i % 300}"
+    flight["flightNumber"] = f"FR{(i + inbound * 1000) % 2000}"
+    flight["price"]["value"] = 10 + i % 200
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections alive, as the real API does
+
+    def do_GET(self):
+        server = self.server.fare_server
+        url = urlsplit(self.path)
+
+        if not url.path.startswith(API_PATH):
+            # The session bootstrap page
+            with server.lock:
+                server.num_bootstraps += 1
+                session = f"mock-{server.num_bootstraps}"
+                server.sessions.add(session)
+            self._respond(
+                200, b"<html></html>", {"Set-Cookie": f"session={session}; Path=/"}
+            )
+            return
+
+        with server.lock:
+            server.num_requests += 1
+            failed = server.random.random() < server.error_rate
+            authorised = (
+                not server.require_session or self._get_session() in server.sessions
+            )
+
+        if not authorised:
+            self._respond(403, b'{"message": "no valid session"}')
+            return
+        if server.latency:
+            time.sleep(server.latency)
+        if failed:
+            self._respond(server.error_status, b'{"message": "mock error"}')
+            return
+
+        endpoint = url.path[len(API_PATH) :]
+        origin = parse_qs(url.query).get("departureAirportIataCode", ["DUB"])[0]
+        body = server.get_payload(endpoint, origin)
+        if body is None:
+            self._respond(404, b'{"message": "unknown endpoint"}')
+        else:
+            self._respond(200, body)
+
+    def _get_session(self) -> Optional[str]:
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookies["session"].value if "session" in cookies else None
+
+    def _respond(self, status: int, body: bytes, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockFareServer:
+    """
+    Serves `oneWayFares` and `roundTripFares` payloads of `num_fares` fares for whichever departure airport is
+    queried, after `latency` seconds. A fraction `error_rate` of fare queries fail with `error_status` instead.
+    With `require_session`, fare queries without a session cookie from the bootstrap page are rejected with a 403.
+    """
+
+    def __init__(
+        self,
+        num_fares: int = 100,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: int = 0,
+        require_session: bool = False,
+    ):
+        self.num_fares = num_fares
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.require_session = require_session
+
+        self.num_requests = 0
+        self.num_bootstraps = 0
+        self.sessions = set()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+        self._payloads = {}
+        self._server = None
+        self._thread = None
+
+    def expire_sessions(self):
+        """
+        Invalidate every session cookie handed out so far.
+        """
+        with self.lock:
+            self.sessions.clear()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_payload(self, endpoint: str, origin: str) -> Optional[bytes]:
+        key = (endpoint, origin)
+        payload = self._payloads.get(key)
+        if payload is None:
+            if endpoint == "oneWayFares":
+                fares = make_one_way_fares(self.num_fares, origin)
+                response = MOCKED_ONE_WAY_RESPONSE
+            elif endpoint == "roundTripFares":
+                fares = make_return_fares(self.num_fares, origin)
+                response = MOCKED_RETURN_RESPONSE
+            else:
+                return None
+            payload = json.dumps({**response, "fares": fares}).encode()
+            self._payloads[key] = payload
+        return payload
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fare_server = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @contextmanager
+    def patch_clients(self):
+        """
+        Point clients created and used within this context at this server, rather than at Ryanair.
+        """
+        with patch.object(
+            _BaseRyanair, "BASE_SERVICES_API_URL", self.url + API_PATH
+        ), patch.object(
+            BaseSessionManager, "BASE_SITE_FOR_SESSION_URL", self.url + "/"
+        ), patch.object(
+            AsyncSessionManager, "BASE_SITE_FOR_SESSION_URL", self.url + "/"
+        ):
+            yield
@@ -0,0 +1,43 @@
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncSessionManager:
+    BASE_SITE_FOR_SESSION_URL = "https://www.ryanair.com/ie/en"
+
+    def __init__(self, max_connections: int = 20, http2: bool = False):
+        if httpx is None:
+            raise ImportError(
+                "AsyncRyanair requires httpx, install it with `pip install ryanair-py[async]`"
+            )
+
+        self.session = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=True,
+        )
+        self._session_cookie_updated = False
+        self._lock = asyncio.Lock()
+
+    async def _update_session_cookie(self):
+        # Visit main website to get session cookies
+        await self.session.get(self.BASE_SITE_FOR_SESSION_URL)
+
+    async def get_session(self):
+        if not self._session_cookie_updated:
+            async with self._lock:
+                if not self._session_cookie_updated:
+                    await self._update_session_cookie()
+                    self._session_cookie_updated = True
+
+        return self.session
+
+    async def close(self):
+        await self.session.aclose()
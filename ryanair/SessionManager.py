@@ -1,16 +1,273 @@
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from http.cookiejar import Cookie
+from typing import Any, Callable, Iterable, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("ryanair")
+
 
+class BaseSessionManager(ABC):
+    """
+    Interface for the HTTP transports which can be passed to `Ryanair(session_manager=...)`.
+    The session returned by `get_session` needs a `get(url, params=...)` method returning a response with
+    `status_code`, `headers`, `content`, `json()` and `raise_for_status()`, as a `requests.Session` does.
+    """
 
-class SessionManager:
     BASE_SITE_FOR_SESSION_URL = "https://www.ryanair.com/ie/en"
 
-    def __init__(self):
-        self.session = requests.Session()
-        self._update_session_cookie()
+    @abstractmethod
+    def get_session(self):
+        pass
 
-    def _update_session_cookie(self):
+    def close(self):
+        pass
+
+
+class _CookieLifecycle:
+    """
+    Tracks when a transport's session cookies expire, and fetches them with `fetch_cookies` before the first query,
+    once they expire, or if a query is rejected as unauthorised. Shared by the `requests` and `httpx` transports.
+    """
+
+    REFRESH_STATUSES = frozenset({401, 403})
+
+    def __init__(
+        self,
+        fetch_cookies: Callable[[], Iterable[Cookie]],
+        max_age: Optional[float] = None,
+    ):
+        """
+        :param fetch_cookies: Visits the main website, and returns the cookies it set.
+        :param max_age: How many seconds to use the cookies for at most, even if they haven't expired.
+        """
+        self.fetch_cookies = fetch_cookies
+        self.max_age = max_age
+
+        self._expires_at = None
+        self._bootstrapped = False
+        self._lock = threading.Lock()
+
+    def expires_within(self, seconds: float) -> bool:
+        """
+        Whether the cookies need refreshing within `seconds`, or already do.
+        """
+        if not self._bootstrapped:
+            return True
+        return (
+            self._expires_at is not None and self._expires_at - time.time() <= seconds
+        )
+
+    def refresh(self):
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        cookies = self.fetch_cookies()
+
+        now = time.time()
+        expiries = [cookie.expires for cookie in cookies if cookie.expires]
+        if self.max_age is not None:
+            expiries.append(now + self.max_age)
+        self._expires_at = min(expiries, default=None)
+        self._bootstrapped = True
+
+    def send(self, request: Callable[[], Any]):
+        """
+        Make a request with fresh cookies, refreshing them and retrying once if it's rejected as unauthorised.
+        """
+        if self.expires_within(0):
+            with self._lock:
+                # Another thread may have refreshed the cookies while we waited
+                if self.expires_within(0):
+                    self._refresh()
+
+        response = request()
+        if response.status_code in self.REFRESH_STATUSES:
+            logger.info(
+                f"Query rejected with a {response.status_code}, refreshing the session cookies and retrying"
+            )
+            self.refresh()
+            response = request()
+        return response
+
+
+class CookieSession(requests.Session):
+    """
+    A session which visits the main website for session cookies before its first query, rather than when it's
+    created, and visits it again once those cookies expire, or if a query is rejected as unauthorised.
+    """
+
+    def __init__(self, bootstrap_url: str, max_age: Optional[float] = None):
+        """
+        :param max_age: How many seconds to use the cookies for at most, even if they haven't expired.
+        """
+        super().__init__()
+        self.bootstrap_url = bootstrap_url
+        self._cookie_lifecycle = _CookieLifecycle(self._fetch_cookies, max_age)
+
+    def expires_within(self, seconds: float) -> bool:
+        return self._cookie_lifecycle.expires_within(seconds)
+
+    def refresh(self):
+        self._cookie_lifecycle.refresh()
+
+    def _fetch_cookies(self):
         # Visit main website to get session cookies
-        self.session.get(self.BASE_SITE_FOR_SESSION_URL)
+        super().request("GET", self.bootstrap_url)
+        return self.cookies
+
+    def request(self, method, url, *args, **kwargs):
+        send = super().request
+        return self._cookie_lifecycle.send(lambda: send(method, url, *args, **kwargs))
+
+
+class SessionManager(BaseSessionManager):
+    DEFAULT_POOL_MAXSIZE = 10
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_connections: Optional[int] = None,
+        pool_block: bool = False,
+        max_age: Optional[float] = None,
+    ):
+        """
+        :param pool_maxsize: How many connections to keep alive per host.
+        :param pool_connections: How many hosts to keep connection pools for, by default `pool_maxsize`.
+        :param pool_block: Whether to wait for a free connection, rather than opening (and then discarding) an
+        extra one, when all `pool_maxsize` connections to a host are in use.
+        :param max_age: How many seconds to use the session cookies for at most, see `CookieSession`.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections or pool_maxsize
+        self.pool_block = pool_block
+        self.max_age = max_age
+
+        self.session = self._create_session()
+
+    def _create_session(self) -> CookieSession:
+        session = CookieSession(self.BASE_SITE_FOR_SESSION_URL, self.max_age)
+        # Size the connection pool so that concurrent queries can each keep a connection alive
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _update_session_cookie(self):
+        self.session.refresh()
 
     def get_session(self):
         return self.session
+
+    def close(self):
+        self.session.close()
+
+
+class _PooledSession:
+    def __init__(self, pool: "SessionPool"):
+        self._pool = pool
+
+    def get(self, url, params=None, **kwargs):
+        with self._pool.checkout() as session:
+            return session.get(url, params=params, **kwargs)
+
+
+class SessionPool(SessionManager):
+    """
+    A pool of `size` sessions, each used by one query at a time, so that no two threads share a cookie jar.
+    Sessions are bootstrapped ("warmed") in the background, rather than on their first query, and refreshed in the
+    background before their cookies expire.
+    """
+
+    DEFAULT_SIZE = 4
+    DEFAULT_REFRESH_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        size: int = DEFAULT_SIZE,
+        pool_maxsize: int = SessionManager.DEFAULT_POOL_MAXSIZE,
+        max_age: Optional[float] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        warm: bool = True,
+    ):
+        """
+        :param pool_maxsize: How many connections each session keeps alive.
+        :param refresh_interval: How often, in seconds, to look for sessions whose cookies are about to expire.
+        :param warm: Whether to bootstrap the sessions in the background straight away.
+        """
+        super().__init__(pool_maxsize=pool_maxsize, max_age=max_age)
+        self.size = size
+        self.refresh_interval = refresh_interval
+
+        self.sessions = [self.session] + [
+            self._create_session() for _ in range(size - 1)
+        ]
+        self._idle = queue.SimpleQueue()
+        for session in self.sessions:
+            self._idle.put(session)
+        self.session = _PooledSession(self)
+
+        self._closed = threading.Event()
+        self._refresher = threading.Thread(
+            target=self._refresh_periodically, args=(warm,), daemon=True
+        )
+        self._refresher.start()
+
+    @contextmanager
+    def checkout(self):
+        """
+        Borrow a session for the duration of the context, waiting for one to be returned if none are idle.
+        """
+        session = self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    def _update_session_cookie(self):
+        for session in self.sessions:
+            session.refresh()
+
+    def _refresh_periodically(self, warm: bool):
+        if warm:
+            self._refresh_expiring(0)
+        while not self._closed.wait(self.refresh_interval):
+            self._refresh_expiring(self.refresh_interval)
+
+    def _refresh_expiring(self, within: float):
+        # Only idle sessions are refreshed, and they're borrowed while they are, so no query's cookie jar is
+        # rewritten under it. Busy sessions are left for the next pass, or refresh themselves before their next query.
+        for _ in range(self.size):
+            if self._closed.is_set():
+                return
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if session.expires_within(within):
+                    session.refresh()
+            except Exception as e:
+                # The session will try again before its next query
+                logger.warning(
+                    f"Couldn't refresh session cookies in the background: {e}"
+                )
+            finally:
+                self._idle.put(session)
+
+    def close(self):
+        self._closed.set()
+        self._refresher.join()
+        for session in self.sessions:
+            session.close()
@@ -1 +1,2 @@
 from ryanair.ryanair import Ryanair
+from ryanair.async_ryanair import AsyncRyanair
@@ -1,13 +1,35 @@
+import hashlib
+import logging
+import mmap
 import os
+import struct
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass
-from math import radians, sin, cos, asin, sqrt
+from math import radians, sin, cos, asin, sqrt, floor, ceil, pi
 
 import csv
-from typing import Any
+from typing import Any, Iterable, Sequence, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 from ryanair.types import Flight
 
+logger = logging.getLogger("ryanair")
+
 AIRPORTS = None
+AIRPORT_INDEX = None
+# Memoised distances between pairs of airports, in both directions
+_DISTANCES = {}
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE_LAT = 111.195
+
+AIRPORTS_CSV_PATH = os.path.join(os.path.dirname(__file__), "airports.csv")
+AIRPORTS_BINARY_PATH = os.path.join(os.path.dirname(__file__), "airports.bin")
 
 
 @dataclass
@@ -23,30 +45,189 @@ def load_airports():
     if AIRPORTS is not None:
         return AIRPORTS
 
-    AIRPORTS = {}
+    # Prefer the compiled airport data, unless it's missing or was compiled from a different CSV
+    if os.path.exists(AIRPORTS_BINARY_PATH):
+        try:
+            table = AirportTable(AIRPORTS_BINARY_PATH)
+            if not os.path.exists(AIRPORTS_CSV_PATH) or table.is_compiled_from(
+                AIRPORTS_CSV_PATH
+            ):
+                AIRPORTS = table
+                return AIRPORTS
+            logger.info("Compiled airports data is out of date, using the CSV")
+        except Exception:
+            logger.exception("Error loading compiled airports data, using the CSV")
+
     try:
-        with open(
-            os.path.join(os.path.dirname(__file__), "airports.csv"),
-            newline="",
-            encoding="utf8",
-        ) as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                row: dict[str, Any] = row
-
-                iata_code = row["iata_code"]
-                location = ",".join((row["iso_region"], row["iso_country"]))
-                lat = float(row["latitude_deg"])
-                lng = float(row["longitude_deg"])
-
-                AIRPORTS[iata_code] = Airport(
-                    IATA_code=iata_code, lat=lat, lng=lng, location=location
-                )
-    except Exception as e:
-        print(f"Error loading airports data: {e}")
+        AIRPORTS = _load_airports_csv(AIRPORTS_CSV_PATH)
+    except Exception:
+        logger.exception("Error loading airports data")
+        AIRPORTS = {}
     return AIRPORTS
 
 
+def _load_airports_csv(path: str) -> dict[str, Airport]:
+    airports = {}
+    with open(path, newline="", encoding="utf8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            row: dict[str, Any] = row
+
+            iata_code = row["iata_code"]
+            location = ",".join((row["iso_region"], row["iso_country"]))
+            lat = float(row["latitude_deg"])
+            lng = float(row["longitude_deg"])
+
+            airports[iata_code] = Airport(
+                IATA_code=iata_code, lat=lat, lng=lng, location=location
+            )
+    return airports
+
+
+class AirportTable(Mapping):
+    """
+    Read-only airport data from a file built by `compile_airports`, memory-mapped rather than read up front.
+    Airports are looked up by binary search over the sorted IATA codes, and only built into `Airport`s on access.
+
+    The file consists of a header, then the sorted 3-letter IATA codes, then the latitudes and longitudes as
+    little-endian float64 arrays, then offsets into a final block of UTF-8 location strings. The header records the
+    size and SHA-256 of the CSV it was compiled from, since file modification times aren't kept by installers.
+    """
+
+    MAGIC = b"RYAP"
+    VERSION = 2
+    _HEADER = struct.Struct("<4sHIQ32s")
+    _CODE_WIDTH = 3
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < self._HEADER.size:
+            raise ValueError(f"{path} is not a compiled airports file")
+        (
+            magic,
+            version,
+            self._count,
+            self.source_size,
+            self.source_digest,
+        ) = self._HEADER.unpack_from(self._mm)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{path} is not a compiled airports file")
+        if sys.byteorder != "little":
+            raise ValueError(
+                "Compiled airports files can only be mapped on little-endian machines"
+            )
+
+        self._codes_offset = _pad8(self._HEADER.size)
+        coords_offset = self._codes_offset + _pad8(self._CODE_WIDTH * self._count)
+        view = memoryview(self._mm)
+        self.lats = view[coords_offset : coords_offset + 8 * self._count].cast("d")
+        self.lngs = view[
+            coords_offset + 8 * self._count : coords_offset + 16 * self._count
+        ].cast("d")
+        locations_offset = coords_offset + 16 * self._count
+        self._location_offsets = view[
+            locations_offset : locations_offset + 4 * (self._count + 1)
+        ].cast("I")
+        self._strings_offset = locations_offset + 4 * (self._count + 1)
+
+    def is_compiled_from(self, csv_path: str) -> bool:
+        """
+        Whether this file was compiled from the CSV at `csv_path`, as it is now.
+        """
+        return os.path.getsize(csv_path) == self.source_size and (
+            _file_digest(csv_path) == self.source_digest
+        )
+
+    def _code(self, i: int) -> bytes:
+        start = self._codes_offset + self._CODE_WIDTH * i
+        return self._mm[start : start + self._CODE_WIDTH]
+
+    def _find(self, iata_code: str) -> int:
+        key = iata_code.encode("ascii", errors="replace")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._code(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._code(lo) == key:
+            return lo
+        raise KeyError(iata_code)
+
+    def __getitem__(self, iata_code: str) -> Airport:
+        if not isinstance(iata_code, str) or len(iata_code) != self._CODE_WIDTH:
+            raise KeyError(iata_code)
+
+        i = self._find(iata_code)
+        start = self._strings_offset + self._location_offsets[i]
+        end = self._strings_offset + self._location_offsets[i + 1]
+        return Airport(
+            IATA_code=iata_code,
+            lat=self.lats[i],
+            lng=self.lngs[i],
+            location=self._mm[start:end].decode("utf8"),
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._code(i).decode("ascii")
+
+    def __len__(self):
+        return self._count
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _file_digest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def compile_airports(
+    csv_path: str = AIRPORTS_CSV_PATH, binary_path: str = AIRPORTS_BINARY_PATH
+):
+    """
+    Compile the airports CSV into the compact binary format read by `AirportTable`.
+    Airports without a 3-letter IATA code are left out, since they can't be looked up.
+    """
+    airports = sorted(
+        (
+            airport
+            for airport in _load_airports_csv(csv_path).values()
+            if len(airport.IATA_code) == AirportTable._CODE_WIDTH
+            and airport.IATA_code.isascii()
+        ),
+        key=lambda airport: airport.IATA_code,
+    )
+    count = len(airports)
+
+    codes = "".join(airport.IATA_code for airport in airports).encode("ascii")
+    locations = [airport.location.encode("utf8") for airport in airports]
+    location_offsets = [0]
+    for location in locations:
+        location_offsets.append(location_offsets[-1] + len(location))
+
+    with open(binary_path, "wb") as f:
+        header = AirportTable._HEADER.pack(
+            AirportTable.MAGIC,
+            AirportTable.VERSION,
+            count,
+            os.path.getsize(csv_path),
+            _file_digest(csv_path),
+        )
+        f.write(header.ljust(_pad8(len(header)), b"\0"))
+        f.write(codes.ljust(_pad8(len(codes)), b"\0"))
+        f.write(struct.pack(f"<{count}d", *(airport.lat for airport in airports)))
+        f.write(struct.pack(f"<{count}d", *(airport.lng for airport in airports)))
+        f.write(struct.pack(f"<{count + 1}I", *location_offsets))
+        f.write(b"".join(locations))
+
+
 def _haversine(lat1, lon1, lat2, lon2):
     """
     Calculate the great circle distance in kilometers between two points
@@ -60,14 +241,187 @@ def _haversine(lat1, lon1, lat2, lon2):
     dlat = lat2 - lat1
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * asin(sqrt(a))
-    r = 6371  # Radius of earth in kilometers.
+    r = EARTH_RADIUS_KM
     return c * r
 
 
+def _haversine_many(lat1, lon1, lat2, lon2) -> list[float]:
+    """
+    `_haversine` over sequences of points, vectorised with NumPy if it is installed.
+    """
+    if np is None:
+        return [_haversine(*points) for points in zip(lat1, lon1, lat2, lon2)]
+
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))).tolist()
+
+
 def get_flight_distance(flight: Flight):
     return get_distance_between_airports(flight.origin, flight.destination)
 
 
 def get_distance_between_airports(iata_a, iata_b):
-    a, b = AIRPORTS[iata_a], AIRPORTS[iata_b]
-    return _haversine(a.lat, a.lng, b.lat, b.lng)
+    distance = _DISTANCES.get((iata_a, iata_b))
+    if distance is None:
+        a, b = AIRPORTS[iata_a], AIRPORTS[iata_b]
+        distance = _haversine(a.lat, a.lng, b.lat, b.lng)
+        _DISTANCES[iata_a, iata_b] = _DISTANCES[iata_b, iata_a] = distance
+    return distance
+
+
+def get_flight_distances(flights: Iterable[Flight]) -> list[float]:
+    """
+    The distance in kilometers covered by each of a batch of flights.
+    """
+    flights = list(flights)
+    return get_distances_between_airports(
+        [flight.origin for flight in flights],
+        [flight.destination for flight in flights],
+    )
+
+
+def get_distances_between_airports(
+    iata_as: Sequence[str], iata_bs: Sequence[str]
+) -> list[float]:
+    """
+    The distances in kilometers between pairs of airports, given as two sequences of IATA codes.
+    Each distinct route is only computed once, in a single vectorised pass, and then memoised.
+    """
+    pairs = list(zip(iata_as, iata_bs))
+    missing = list({pair for pair in pairs if pair not in _DISTANCES})
+    if missing:
+        a = [AIRPORTS[iata_a] for iata_a, _ in missing]
+        b = [AIRPORTS[iata_b] for _, iata_b in missing]
+        distances = _haversine_many(
+            [airport.lat for airport in a],
+            [airport.lng for airport in a],
+            [airport.lat for airport in b],
+            [airport.lng for airport in b],
+        )
+        for (iata_a, iata_b), distance in zip(missing, distances):
+            _DISTANCES[iata_a, iata_b] = _DISTANCES[iata_b, iata_a] = distance
+
+    return [_DISTANCES[pair] for pair in pairs]
+
+
+class AirportIndex:
+    """
+    A spatial index over airports, bucketing them into a grid of latitude/longitude cells so that radius and
+    nearest-neighbour queries only need to look at airports in nearby cells.
+    """
+
+    def __init__(self, airports: Iterable[Airport], cell_size_deg: float = 1.0):
+        self.cell_size_deg = cell_size_deg
+        self._num_rows = ceil(180 / cell_size_deg)
+        self._num_cols = ceil(360 / cell_size_deg)
+        self._cells = {}
+        self._size = 0
+
+        for airport in airports:
+            self._cells.setdefault(self._cell(airport.lat, airport.lng), []).append(
+                airport
+            )
+            self._size += 1
+
+    def _row(self, lat):
+        return min(floor((lat + 90) / self.cell_size_deg), self._num_rows - 1)
+
+    def _col(self, lng):
+        return floor((lng + 180) / self.cell_size_deg) % self._num_cols
+
+    def _cell(self, lat, lng):
+        return self._row(lat), self._col(lng)
+
+    def within(self, lat: float, lng: float, radius_km: float):
+        """
+        All airports within `radius_km` of a point, as `(distance_km, Airport)` tuples sorted by distance.
+        """
+        lat_delta = radius_km / KM_PER_DEGREE_LAT
+        min_lat, max_lat = max(lat - lat_delta, -90), min(lat + lat_delta, 90)
+
+        # Degrees of longitude get shorter towards the poles, so size the band for the most poleward latitude
+        max_abs_lat = max(abs(min_lat), abs(max_lat))
+        if max_abs_lat >= 90 or lat_delta / cos(radians(max_abs_lat)) >= 180:
+            cols = range(self._num_cols)
+        else:
+            lng_delta = lat_delta / cos(radians(max_abs_lat))
+            first_col = floor((lng - lng_delta + 180) / self.cell_size_deg)
+            last_col = floor((lng + lng_delta + 180) / self.cell_size_deg)
+            cols = {
+                col % self._num_cols
+                for col in range(
+                    first_col, min(last_col, first_col + self._num_cols - 1) + 1
+                )
+            }
+
+        results = []
+        for row in range(self._row(min_lat), self._row(max_lat) + 1):
+            for col in cols:
+                for airport in self._cells.get((row, col), ()):
+                    distance = _haversine(lat, lng, airport.lat, airport.lng)
+                    if distance <= radius_km:
+                        results.append((distance, airport))
+
+        results.sort(key=lambda result: result[0])
+        return results
+
+    def nearest(self, lat: float, lng: float, k: int = 1):
+        """
+        The `k` airports nearest to a point, as `(distance_km, Airport)` tuples sorted by distance.
+        """
+        k = min(k, self._size)
+        if k <= 0:
+            return []
+
+        # Widen the search until it contains k airports; everything inside the radius is found exactly,
+        # so the k nearest of those are the k nearest overall.
+        radius_km = 100
+        max_radius_km = EARTH_RADIUS_KM * pi
+        while True:
+            results = self.within(lat, lng, radius_km)
+            if len(results) >= k or radius_km >= max_radius_km:
+                return results[:k]
+            radius_km *= 2
+
+    def __len__(self):
+        return self._size
+
+
+def get_airport_index() -> AirportIndex:
+    global AIRPORT_INDEX
+    if AIRPORT_INDEX is None:
+        AIRPORT_INDEX = AirportIndex(load_airports().values())
+    return AIRPORT_INDEX
+
+
+def get_airports_within_radius(lat: float, lng: float, radius_km: float):
+    return get_airport_index().within(lat, lng, radius_km)
+
+
+def get_nearest_airports(lat: float, lng: float, k: int = 1):
+    return get_airport_index().nearest(lat, lng, k)
+
+
+def get_airports_near(iata_code: str, radius_km: float):
+    """
+    All other airports within `radius_km` of the given airport.
+    """
+    airport = load_airports()[iata_code]
+    return [
+        (distance, other)
+        for distance, other in get_airports_within_radius(
+            airport.lat, airport.lng, radius_km
+        )
+        if other.IATA_code != iata_code
+    ]
+
+
+if __name__ == "__main__":
+    # Also run when the package is built, see setup.py: python -m ryanair.airport_utils [airports.csv] [airports.bin]
+    compile_airports(*sys.argv[1:3])
@@ -0,0 +1,276 @@
+"""
+An asyncio flavour of the Ryanair client, so that many fare queries can be kept in flight at once.
+Queries and parsing are shared with the synchronous client, so results are identical.
+"""
+import asyncio
+from datetime import datetime, date, time
+from itertools import islice, product
+from time import perf_counter
+from typing import Union, Optional, Iterable, AsyncIterator, Callable
+
+from ryanair.AsyncSessionManager import AsyncSessionManager
+from ryanair.cache import Cache, make_cache_key
+from ryanair.coalesce import AsyncSingleFlight
+from ryanair.concurrency import AIMDController
+from ryanair.metrics import Metrics
+from ryanair.ratelimit import RateLimiter, TokenBucket
+from ryanair.retry import RetryPolicy
+from ryanair.routes import RouteGraph
+from ryanair.ryanair import _BaseRyanair
+from ryanair.types import Flight, Trip, FareView
+
+
+class AsyncRyanair(_BaseRyanair):
+    DEFAULT_MAX_CONCURRENCY = 20
+
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: Optional[Cache] = None,
+        route_graph: Optional[RouteGraph] = None,
+        coalesce_queries: bool = True,
+        metrics: Optional[Metrics] = None,
+        session_manager: Optional[AsyncSessionManager] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_controller: Optional[AIMDController] = None,
+    ):
+        super().__init__(
+            currency,
+            cache,
+            route_graph,
+            metrics,
+            retry_policy,
+            rate_limiter,
+            concurrency_controller,
+        )
+
+        self.max_concurrency = max_concurrency
+        self._single_flight = AsyncSingleFlight() if coalesce_queries else None
+        self.session_manager = session_manager or AsyncSessionManager(
+            max_connections=max_concurrency
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight_changed = asyncio.Condition()
+        self._retryable_query = self._with_retries(self._query_once)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self.session_manager.close()
+
+    async def get_cheapest_flights(
+        self,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        departure_time_from: Union[str, time] = "00:00",
+        departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+        as_table: bool = False,
+        predicate: Optional[Callable[[FareView], bool]] = None,
+    ):
+        query_url, params = self._get_cheapest_flights_params(
+            airport,
+            date_from,
+            date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            departure_time_from=departure_time_from,
+            departure_time_to=departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+
+        response = (await self._query(query_url, params))["fares"]
+
+        return self._parse_cheapest_flights(response, as_table, predicate)
+
+    async def get_cheapest_return_flights(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        outbound_departure_time_from: Union[str, time] = "00:00",
+        outbound_departure_time_to: Union[str, time] = "23:59",
+        inbound_departure_time_from: Union[str, time] = "00:00",
+        inbound_departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+        predicate: Optional[Callable[[FareView, FareView], bool]] = None,
+    ):
+        query_url, params = self._get_cheapest_return_flights_params(
+            source_airport,
+            date_from,
+            date_to,
+            return_date_from,
+            return_date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            outbound_departure_time_from=outbound_departure_time_from,
+            outbound_departure_time_to=outbound_departure_time_to,
+            inbound_departure_time_from=inbound_departure_time_from,
+            inbound_departure_time_to=inbound_departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+
+        response = (await self._query(query_url, params))["fares"]
+
+        return self._parse_cheapest_return_flights(response, predicate)
+
+    def iter_cheapest_flights(
+        self,
+        airports: Iterable[str],
+        date_windows: Iterable[tuple],
+        max_concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[Flight]:
+        """
+        Query every combination of origin airport and `(date_from, date_to)` window concurrently,
+        yielding flights as each response arrives.
+        At most `max_concurrency` queries are in flight at once, and the first failed query is raised.
+        Any other keyword arguments are passed through to `get_cheapest_flights`.
+        """
+        return self._iter_concurrently(
+            lambda query: self.get_cheapest_flights(query[0], *query[1], **kwargs),
+            product(airports, date_windows),
+            max_concurrency,
+        )
+
+    def iter_cheapest_return_flights(
+        self,
+        source_airports: Iterable[str],
+        date_windows: Iterable[tuple],
+        max_concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[Trip]:
+        """
+        Query every combination of origin airport and `(date_from, date_to, return_date_from, return_date_to)` window
+        concurrently, yielding trips as each response arrives.
+        At most `max_concurrency` queries are in flight at once, and the first failed query is raised.
+        Any other keyword arguments are passed through to `get_cheapest_return_flights`.
+        """
+        return self._iter_concurrently(
+            lambda query: self.get_cheapest_return_flights(
+                query[0], *query[1], **kwargs
+            ),
+            product(source_airports, date_windows),
+            max_concurrency,
+        )
+
+    async def _iter_concurrently(
+        self, query: Callable, items: Iterable, max_concurrency: Optional[int]
+    ):
+        max_concurrency = max_concurrency or self.max_concurrency
+        items = iter(items)
+        in_flight = {
+            asyncio.ensure_future(query(item))
+            for item in islice(items, max_concurrency)
+        }
+        try:
+            while in_flight:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                in_flight.update(
+                    asyncio.ensure_future(query(item))
+                    for item in islice(items, len(done))
+                )
+                for task in done:
+                    for result in task.result():
+                        yield result
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _query(self, url, params=None):
+        response = self._get_cached_response(url, params)
+        if response is not None:
+            return response
+
+        if self._single_flight is None:
+            return await self._fetch(url, params)
+
+        # Identical queries already in flight in other tasks share that query's response
+        response, shared = await self._single_flight.do(
+            make_cache_key(url, params), lambda: self._fetch(url, params)
+        )
+        if shared:
+            self._coalesced_queries += 1
+        return response
+
+    async def _fetch(self, url, params=None):
+        response = await self._retryable_query(url, params)
+        self._cache_response(url, params, response)
+        return response
+
+    async def _query_once(self, url, params=None):
+        testing = self.retry_policy.before_query()
+        try:
+            if self.rate_limiter is not None:
+                # Waited for before taking a concurrency slot, so that the slot isn't held idle
+                wait = await self._reserve_rate_limit_async(url)
+                if wait:
+                    await asyncio.sleep(wait)
+            session = await self.session_manager.get_session()
+            # Only hold a concurrency slot while the request is actually in flight, not during backoff
+            async with self._semaphore:
+                self._num_queries += 1
+                if self.metrics is None and self.concurrency_controller is None:
+                    response = await session.get(url, params=params)
+                else:
+                    response = await self._controlled_get(session, url, params)
+            response.raise_for_status()
+            return self._parse_json(response)
+        except Exception:
+            raise
+        except BaseException:
+            # A cancelled query is never seen by the retries, so the circuit breaker is told here
+            self.retry_policy.record_interrupted(testing)
+            raise
+
+    async def _reserve_rate_limit_async(self, url) -> float:
+        if isinstance(self.rate_limiter, TokenBucket):
+            return self._reserve_rate_limit(url)
+        # Other limiters, such as SQLiteTokenBucket, may block while other processes hold the bucket,
+        # so are kept off the event loop
+        wait = await asyncio.to_thread(self.rate_limiter.reserve)
+        self._record_rate_limit_wait(url, wait)
+        return wait
+
+    async def _controlled_get(self, session, url, params=None):
+        controller = self.concurrency_controller
+        if controller is not None:
+            async with self._in_flight_changed:
+                await self._in_flight_changed.wait_for(
+                    lambda: self._in_flight < controller.limit
+                )
+                self._in_flight += 1
+
+        start = perf_counter()
+        try:
+            response = await session.get(url, params=params)
+        except Exception:
+            if controller is not None:
+                controller.record(perf_counter() - start, None)
+            raise
+        finally:
+            if controller is not None:
+                async with self._in_flight_changed:
+                    self._in_flight -= 1
+                    self._in_flight_changed.notify_all()
+        self._record_response(url, response, perf_counter() - start)
+        return response
@@ -0,0 +1,222 @@
+"""
+Optional caches for raw API responses, keyed on the query URL and its (already formatted) params.
+"""
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+
+def make_cache_key(url: str, params: Optional[dict] = None) -> str:
+    if not params:
+        return url
+    return "?".join((url, urlencode(sorted((k, str(v)) for k, v in params.items()))))
+
+
+class Cache(ABC):
+    """
+    Interface for response caches which can be passed to `Ryanair(cache=...)`.
+    """
+
+    @abstractmethod
+    def get(self, url: str, params: Optional[dict] = None) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(
+        self,
+        url: str,
+        params: Optional[dict],
+        response: Any,
+        ttl: Optional[float] = None,
+    ):
+        pass
+
+    @abstractmethod
+    def invalidate(self, url: Optional[str] = None, params: Optional[dict] = None):
+        """
+        Drop the entry for a single query, or every entry if no URL is given.
+        """
+
+
+class MemoryCache(Cache):
+    DEFAULT_TTL = 600
+    DEFAULT_MAX_ENTRIES = 1024
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict] = None) -> Optional[Any]:
+        key = make_cache_key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return response
+
+    def set(
+        self,
+        url: str,
+        params: Optional[dict],
+        response: Any,
+        ttl: Optional[float] = None,
+    ):
+        key = make_cache_key(url, params)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url: Optional[str] = None, params: Optional[dict] = None):
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(make_cache_key(url, params), None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCache(Cache):
+    """
+    A cache persisted to an SQLite database, so that it survives restarts and can be shared between processes.
+    Each thread gets its own connection, and the database runs in WAL mode so readers don't block writers.
+    """
+
+    DEFAULT_TTL = 600
+    DEFAULT_MAX_ENTRIES = 100_000
+    BUSY_TIMEOUT = 30
+    EVICTION_INTERVAL = 100
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "response TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at)"
+            )
+        # Processes may not live long enough to write EVICTION_INTERVAL entries, so also evict when opened
+        self.evict()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str, params: Optional[dict] = None) -> Optional[Any]:
+        entry = self.get_entry(url, params)
+        return None if entry is None else entry[1]
+
+    def get_entry(self, url: str, params: Optional[dict] = None):
+        """
+        Returns a `(fetched_at, response)` tuple for an unexpired entry, or `None`.
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT fetched_at, response FROM responses WHERE key = ? AND expires_at > ?",
+                (make_cache_key(url, params), time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(
+        self,
+        url: str,
+        params: Optional[dict],
+        response: Any,
+        ttl: Optional[float] = None,
+    ):
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._connection() as conn:
+            rowid = conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (make_cache_key(url, params), json.dumps(response), now, expires_at),
+            ).lastrowid
+
+        # Eviction scans the table, so only do it every so often rather than on every write. Each write gets the
+        # next rowid, so this counts the writes made by every process sharing the database, not just this one.
+        if rowid % self.EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove expired entries, then the oldest entries beyond `max_entries`.
+        """
+        with self._connection() as conn:
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, url: Optional[str] = None, params: Optional[dict] = None):
+        with self._connection() as conn:
+            if url is None:
+                conn.execute("DELETE FROM responses")
+            else:
+                conn.execute(
+                    "DELETE FROM responses WHERE key = ?",
+                    (make_cache_key(url, params),),
+                )
+
+    def __len__(self):
+        return (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM responses WHERE expires_at > ?", (time.time(),)
+            )
+            .fetchone()[0]
+        )
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
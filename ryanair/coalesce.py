@@ -0,0 +1,107 @@
+"""
+Request coalescing ("single-flight"): while a call for a key is in flight, other callers for the same key wait for
+its result instead of making their own call.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "exception")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls from multiple threads.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """
+        Call `fn`, unless a call for `key` is already in flight, in which case wait for and share its outcome.
+        Returns the result, and whether it was shared from another caller's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls from multiple tasks on the same event loop.
+    The call runs as its own task, so cancelling any one caller, including the first, doesn't affect the others.
+    It's only cancelled once every caller waiting for it has been.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Await `fn()`, unless a call for `key` is already in flight, in which case wait for and share its outcome.
+        Returns the result, and whether it was shared from another caller's call.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if not shared:
+            call = self._calls[key] = _AsyncCall(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda task: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Forget the call straight away, as the task is only cancelled once it next runs, and a caller
+                # arriving before then mustn't share it
+                self._forget_call(key, call)
+                call.task.cancel()
+
+    def _forget_call(self, key: Hashable, call: _AsyncCall):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _forget(self, key: Hashable, call: _AsyncCall):
+        self._forget_call(key, call)
+        if not call.task.cancelled():
+            # Mark any exception as retrieved, in case nobody was left waiting for it
+            call.task.exception()
@@ -0,0 +1,103 @@
+"""
+Adaptive concurrency control: the number of queries allowed in flight at once is raised while the API is healthy,
+and cut when it throttles us, errors, or slows down, in the way TCP congestion control finds a sending rate (AIMD).
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger("ryanair")
+
+
+class AIMDController:
+    """
+    Each healthy response raises the limit by `increase / limit`, so roughly by `increase` for every `limit`
+    responses. A 429 or 5xx response, a failed request, or a latency more than `latency_spike_factor` times the usual
+    latency cuts the limit to `backoff_ratio` of what it was. Signals from queries which were already in flight at
+    the last cut are ignored, so that one congestion episode only cuts the limit once.
+    Pass one to `Ryanair(concurrency_controller=...)`, and read `limit` to monitor it.
+    """
+
+    DEFAULT_INITIAL_LIMIT = 4
+    DEFAULT_MIN_LIMIT = 1
+    DEFAULT_MAX_LIMIT = 64
+
+    def __init__(
+        self,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        increase: float = 1.0,
+        backoff_ratio: float = 0.5,
+        latency_spike_factor: Optional[float] = 3.0,
+        latency_smoothing: float = 0.1,
+    ):
+        """
+        :param latency_spike_factor: `None` to only react to errors, and not to latency.
+        :param latency_smoothing: The weight given to each healthy response in the moving average of latency.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff_ratio = backoff_ratio
+        self.latency_spike_factor = latency_spike_factor
+        self.latency_smoothing = latency_smoothing
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._latency = None
+        self._last_cut = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """
+        How many queries may currently be in flight at once.
+        """
+        return int(self._limit)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        The moving average latency of healthy responses, in seconds.
+        """
+        return self._latency
+
+    def record(self, seconds: float, status: Optional[int]):
+        """
+        Record how long a request took, and the status of its response, or `None` if it failed without one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            reason = self._overload_reason(seconds, status)
+            if reason is None:
+                self._limit = min(
+                    self._limit + self.increase / self._limit, float(self.max_limit)
+                )
+                self._latency = (
+                    seconds
+                    if self._latency is None
+                    else self._latency
+                    + self.latency_smoothing * (seconds - self._latency)
+                )
+                return
+
+            if now - seconds < self._last_cut:
+                return
+            self._limit = max(self._limit * self.backoff_ratio, float(self.min_limit))
+            self._last_cut = now
+            limit = self.limit
+        logger.info(f"Concurrency limit cut to {limit} after {reason}")
+
+    def _overload_reason(self, seconds: float, status: Optional[int]) -> Optional[str]:
+        if status is None:
+            return "a failed request"
+        if status == 429 or status >= 500:
+            return f"a {status} response"
+        if (
+            self.latency_spike_factor is not None
+            and self._latency is not None
+            and seconds > self._latency * self.latency_spike_factor
+        ):
+            return f"a latency spike ({seconds:.2f}s, usually {self._latency:.2f}s)"
+        return None
@@ -0,0 +1,220 @@
+"""
+Search for the cheapest self-transfer itineraries between two airports, by joining one-way fares.
+"""
+import heapq
+from datetime import datetime, date, timedelta, time
+from itertools import count
+from typing import Iterable, Union, Optional
+
+from ryanair import airport_utils
+from ryanair.ryanair import Ryanair, logger
+from ryanair.types import BatchResult, Flight, Itinerary
+
+
+class ItinerarySearch:
+    """
+    Fares are fetched outward from the origin one level (i.e. one more leg) at a time. Partial itineraries are
+    pruned once they cost more than the k-th cheapest complete itinerary found so far, or when their connecting
+    airport is too much of a detour, as judged by the airport data in `airport_utils`.
+    """
+
+    DEFAULT_MIN_CONNECTION = timedelta(hours=2)
+    DEFAULT_MAX_CONNECTION = timedelta(hours=24)
+    DEFAULT_MAX_QUERIES = 50
+    DEFAULT_MAX_DETOUR = 1.5
+
+    def __init__(
+        self,
+        ryanair: Ryanair,
+        min_connection: timedelta = DEFAULT_MIN_CONNECTION,
+        max_connection: timedelta = DEFAULT_MAX_CONNECTION,
+        max_queries: int = DEFAULT_MAX_QUERIES,
+        max_detour: Optional[float] = DEFAULT_MAX_DETOUR,
+    ):
+        """
+        :param max_queries: The most fare queries a single search may make.
+        :param max_detour: How much further than the direct distance an itinerary may travel, e.g. 1.5 allows
+        connections adding up to 50% to the distance. `None` disables this pruning.
+        """
+        self.ryanair = ryanair
+        self.min_connection = min_connection
+        self.max_connection = max_connection
+        self.max_queries = max_queries
+        self.max_detour = max_detour
+
+        self.num_queries = 0
+
+    def search(
+        self,
+        origin: str,
+        destination: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        max_stops: int = 1,
+        k: int = 5,
+        max_price: Optional[float] = None,
+    ) -> list[Itinerary]:
+        """
+        The `k` cheapest itineraries departing `origin` between the given dates and arriving at `destination`,
+        with at most `max_stops` connections, cheapest first.
+        """
+        self.num_queries = 0
+        best = []  # Max-heap (by negated price) of the k cheapest complete itineraries
+        tie_breaker = count()
+
+        def bound():
+            if len(best) == k:
+                return -best[0][0]
+            return max_price if max_price is not None else float("inf")
+
+        def add(legs):
+            price = sum(leg.price for leg in legs)
+            if price < bound():
+                heapq.heappush(best, (-price, next(tie_breaker), legs))
+                if len(best) > k:
+                    heapq.heappop(best)
+
+        # The API only returns the cheapest fare per destination for the whole range, so query each day separately
+        # to have every day's departures to connect from
+        first_queries = [
+            (
+                origin,
+                day.isoformat(),
+                "00:00",
+                "23:59",
+                destination if max_stops == 0 else None,
+            )
+            for day, _ in Ryanair._split_date_range(date_from, date_to, 1)
+        ]
+        batch = self._run_queries(first_queries)
+        if batch.errors and not batch.results:
+            raise next(iter(batch.errors.values()))
+        frontier = [
+            [flight]
+            for query in first_queries
+            for flight in batch.results.get(query, ())
+        ]
+
+        for stops in range(max_stops + 1):
+            partials = []
+            for legs in frontier:
+                if legs[-1].destination == destination:
+                    add(legs)
+                elif stops < max_stops and self._is_worth_extending(legs, destination):
+                    partials.append(legs)
+
+            # Extend the cheapest partial itineraries first, since they're the most likely to lead somewhere
+            partials.sort(key=lambda legs: sum(leg.price for leg in legs))
+            partials = [
+                legs
+                for legs in partials
+                if sum(leg.price for leg in legs) < bound()
+                and legs[-1].arrivalTime is not None
+            ]
+            frontier = self._extend(partials, destination, last=stops + 1 == max_stops)
+
+        return [
+            Itinerary(totalPrice=-price, legs=legs)
+            for price, _, legs in sorted(best, reverse=True)
+        ]
+
+    def _is_worth_extending(self, legs: list[Flight], destination: str) -> bool:
+        visited = {legs[0].origin} | {leg.destination for leg in legs[:-1]}
+        if legs[-1].destination in visited:
+            return False
+        if self.max_detour is None:
+            return True
+
+        airport_utils.load_airports()
+        try:
+            direct = airport_utils.get_distance_between_airports(
+                legs[0].origin, destination
+            )
+            travelled = sum(
+                airport_utils.get_distance_between_airports(leg.origin, leg.destination)
+                for leg in legs
+            )
+            remaining = airport_utils.get_distance_between_airports(
+                legs[-1].destination, destination
+            )
+        except (KeyError, TypeError):
+            # Without coordinates for every airport involved, we can't judge the detour
+            return True
+        return travelled + remaining <= self.max_detour * direct
+
+    def _extend(self, partials: list[list[Flight]], destination: str, last: bool):
+        """
+        Query onward fares from the end of each partial itinerary, within the query budget,
+        and join them on the connection time.
+        """
+        batch = self._run_queries(
+            query
+            for legs in partials
+            for query in self._connection_queries(
+                legs[-1], destination if last else None
+            )
+        )
+
+        extended = []
+        for legs in partials:
+            for query in self._connection_queries(
+                legs[-1], destination if last else None
+            ):
+                for flight in batch.results.get(query, ()):
+                    connection = flight.departureTime - legs[-1].arrivalTime
+                    if self.min_connection <= connection <= self.max_connection:
+                        extended.append(legs + [flight])
+        return extended
+
+    def _run_queries(self, queries: Iterable[tuple]) -> BatchResult:
+        """
+        Run the distinct `(airport, day, time from, time to, destination)` queries concurrently, stopping once the
+        query budget is spent. Failed queries are logged and left out of the results.
+        """
+        planned = {}
+        for query in queries:
+            if query in planned:
+                continue
+            if self.num_queries >= self.max_queries:
+                logger.info(
+                    f"Itinerary search query budget of {self.max_queries} reached, results may be incomplete"
+                )
+                break
+            planned[query] = None
+            self.num_queries += 1
+
+        batch = self.ryanair.run_many(
+            lambda query: self.ryanair.get_cheapest_flights(
+                query[0],
+                query[1],
+                query[1],
+                departure_time_from=query[2],
+                departure_time_to=query[3],
+                destination_airport=query[4],
+            ),
+            planned,
+            None,
+        )
+        for query, error in batch.errors.items():
+            logger.warning(f"Itinerary search query {query} failed: {error}")
+        return batch
+
+    def _connection_queries(self, arriving: Flight, destination: Optional[str]):
+        """
+        One query per day of the connection window, each limited to the departure times that make the connection.
+        """
+        earliest = arriving.arrivalTime + self.min_connection
+        latest = arriving.arrivalTime + self.max_connection
+
+        day = earliest.date()
+        while day <= latest.date():
+            time_from = earliest.time() if day == earliest.date() else time(0, 0)
+            time_to = latest.time() if day == latest.date() else time(23, 59)
+            yield (
+                arriving.destination,
+                day.isoformat(),
+                time_from.strftime("%H:%M"),
+                time_to.strftime("%H:%M"),
+                destination,
+            )
+            day += timedelta(days=1)
@@ -0,0 +1,133 @@
+"""
+Optional instrumentation hooks, which can be passed to `Ryanair(metrics=...)` to forward query latency, retries,
+response sizes and parse times to a metrics system such as Prometheus or StatsD.
+"""
+import bisect
+import threading
+from typing import Optional
+
+
+def get_endpoint(url: str) -> str:
+    """
+    The endpoint a query URL is for, e.g. "oneWayFares", which is what measurements are labelled with.
+    """
+    return url.rsplit("/", 1)[-1]
+
+
+class Metrics:
+    """
+    Interface for metrics hooks. Every hook is a no-op by default, so only the ones of interest need overriding.
+    Hooks may be called from several threads at once.
+    """
+
+    def on_request(
+        self, endpoint: str, seconds: float, num_bytes: int, status: Optional[int]
+    ):
+        """
+        Called after each HTTP request (including each retry) which got a response, of any status.
+        """
+
+    def on_retry(self, endpoint: str, tries: int, exception: BaseException):
+        """
+        Called when a failed query is about to be retried, after `tries` attempts so far.
+        """
+
+    def on_give_up(self, endpoint: str, tries: int, exception: BaseException):
+        """
+        Called when a query has failed after `tries` attempts and will not be retried again.
+        """
+
+    def on_parse(self, endpoint: str, seconds: float, num_items: int):
+        """
+        Called after the fares in a response have been parsed into `num_items` flights or trips.
+        """
+
+    def on_rate_limit(self, endpoint: str, seconds: float):
+        """
+        Called before each request when a rate limiter is in use, with how long it has to wait for the limiter.
+        """
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket boundaries, in the style of a Prometheus histogram.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # The last count is for +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """
+        `(upper bound, number of observations <= upper bound)` for each bucket, ending with +Inf.
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class MetricsRecorder(Metrics):
+    """
+    Keeps per-endpoint histograms and counters in memory, for inspection or for exporting periodically.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS):
+        self.buckets = buckets
+
+        self.latency = {}
+        self.parse_time = {}
+        self.rate_limit_wait = {}
+        self.requests = {}
+        self.retries = {}
+        self.give_ups = {}
+        self.bytes_received = {}
+        self.statuses = {}
+
+        self._lock = threading.Lock()
+
+    def on_request(
+        self, endpoint: str, seconds: float, num_bytes: int, status: Optional[int]
+    ):
+        with self._lock:
+            self._histogram(self.latency, endpoint).observe(seconds)
+            self._increment(self.requests, endpoint)
+            self._increment(self.bytes_received, endpoint, num_bytes)
+            self._increment(self.statuses, (endpoint, status))
+
+    def on_retry(self, endpoint: str, tries: int, exception: BaseException):
+        with self._lock:
+            self._increment(self.retries, endpoint)
+
+    def on_give_up(self, endpoint: str, tries: int, exception: BaseException):
+        with self._lock:
+            self._increment(self.give_ups, endpoint)
+
+    def on_parse(self, endpoint: str, seconds: float, num_items: int):
+        with self._lock:
+            self._histogram(self.parse_time, endpoint).observe(seconds)
+
+    def on_rate_limit(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._histogram(self.rate_limit_wait, endpoint).observe(seconds)
+
+    def _histogram(self, histograms: dict, endpoint: str) -> Histogram:
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = Histogram(self.buckets)
+        return histogram
+
+    @staticmethod
+    def _increment(counters: dict, key, amount: int = 1):
+        counters[key] = counters.get(key, 0) + amount
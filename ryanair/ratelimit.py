@@ -0,0 +1,115 @@
+"""
+Client-side rate limiting, so that sweeps pace themselves instead of being throttled or blocked.
+Pass a limiter to `Ryanair(rate_limiter=...)`. Every attempt at a query, including retries, takes a token.
+"""
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class RateLimiter(ABC):
+    """
+    Interface for rate limiters. Limiters hand out reservations instead of blocking, so that the same limiter can
+    pace threads, asyncio tasks and processes alike.
+    """
+
+    @abstractmethod
+    def reserve(self) -> float:
+        """
+        Take a token, returning how many seconds to wait before it may be used.
+        """
+
+
+def _take_token(tokens: float, elapsed: float, rate: float, burst: int):
+    """
+    Refill a bucket holding `tokens` for `elapsed` seconds, then take a token from it.
+    Returns the tokens left, which are negative if the token had to be borrowed, and how long to wait for it.
+    """
+    tokens = min(float(burst), tokens + max(elapsed, 0.0) * rate) - 1
+    return tokens, max(-tokens / rate, 0.0)
+
+
+class TokenBucket(RateLimiter):
+    """
+    Allows bursts of up to `burst` queries, and `rate` queries per second on average, across all threads.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _take_token(
+                self._tokens, now - self._updated_at, self.rate, self.burst
+            )
+            self._updated_at = now
+        return wait
+
+
+class SQLiteTokenBucket(RateLimiter):
+    """
+    A `TokenBucket` kept in an SQLite database, so that every process on the host using the same `path` (and `name`)
+    shares one budget. The bucket is updated within an exclusive transaction, so reservations are atomic.
+    """
+
+    BUSY_TIMEOUT = 30
+
+    def __init__(self, path: str, rate: float, burst: int = 1, name: str = "ryanair"):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.name = name
+
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, "
+                "tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Transactions are managed explicitly, so that they can be started with BEGIN IMMEDIATE
+            conn = sqlite3.connect(
+                self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def reserve(self) -> float:
+        conn = self._connection()
+        # Take the write lock up front, so no other process can update the bucket between our read and write
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens, updated_at = row if row is not None else (float(self.burst), now)
+            tokens, wait = _take_token(tokens, now - updated_at, self.rate, self.burst)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,238 @@
+"""
+Which failed queries are worth retrying, how long to wait before retrying them, and a circuit breaker which fails
+queries fast while the API is down, rather than retrying each of them in turn.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+
+import backoff
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+logger = logging.getLogger("ryanair")
+
+# Other request errors, such as an invalid URL, too many redirects or a malformed body, would fail again if retried.
+# An HTTPError is only found here without a response, when there's no status to tell whether it's transient.
+_TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    requests.HTTPError,
+) + (
+    (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+    if httpx is not None
+    else ()
+)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_in: float):
+        super().__init__(
+            f"Ryanair API: Failing fast after repeated failures, retrying in {retry_in:.1f}s"
+        )
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed attempts, after which queries fail immediately with a
+    `CircuitOpenError` for `cooldown` seconds. Then a single query is let through to test the API: if it succeeds
+    the circuit closes again, and if it fails the circuit stays open for another cooldown.
+    """
+
+    DEFAULT_FAILURE_THRESHOLD = 10
+    DEFAULT_COOLDOWN = 30.0
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._failures = 0
+        self._opened_at = None
+        self._testing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_query(self) -> bool:
+        """
+        Raises `CircuitOpenError` if the query should fail fast.
+        Returns whether the query is the one testing the API, which must be followed by `record_success`,
+        `record_failure` or, if it ends without an outcome, `release_test`.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+
+            retry_in = self._opened_at + self.cooldown - time.monotonic()
+            if retry_in > 0 or self._testing:
+                raise CircuitOpenError(max(retry_in, 0))
+
+            self._testing = True
+        logger.info("Circuit breaker cooldown over, testing the API with one query")
+        return True
+
+    def release_test(self):
+        """
+        Let another query test the API, as the one testing it was cancelled or interrupted.
+        """
+        with self._lock:
+            self._testing = False
+
+    def record_success(self):
+        with self._lock:
+            was_open = self._opened_at is not None
+            self._failures = 0
+            self._opened_at = None
+            self._testing = False
+        if was_open:
+            logger.info("Circuit breaker closed, the API is responding again")
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if not self._testing and (
+                self._opened_at is not None or self._failures < self.failure_threshold
+            ):
+                return
+            self._opened_at = time.monotonic()
+            self._testing = False
+            failures = self._failures
+        logger.warning(
+            f"Circuit breaker opened after {failures} consecutive failures, failing fast for {self.cooldown}s"
+        )
+
+
+class RetryPolicy:
+    """
+    Retries connection errors, timeouts and responses with a status in `retry_statuses`, up to `max_tries` attempts
+    in all. Any other error, such as a 400 for a bad airport code, is raised straight away.
+    A `Retry-After` header is waited for instead of the usual backoff, unless it's longer than `max_retry_after`
+    seconds, in which case the query is given up on.
+    """
+
+    DEFAULT_MAX_TRIES = 5
+    DEFAULT_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+    DEFAULT_MAX_RETRY_AFTER = 60.0
+
+    def __init__(
+        self,
+        max_tries: int = DEFAULT_MAX_TRIES,
+        retry_statuses: frozenset[int] = DEFAULT_RETRY_STATUSES,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.max_tries = max_tries
+        self.retry_statuses = retry_statuses
+        self.max_retry_after = max_retry_after
+        self.circuit_breaker = circuit_breaker
+
+    @staticmethod
+    def get_status(exception: BaseException) -> Optional[int]:
+        response = getattr(exception, "response", None)
+        status = getattr(response, "status_code", None)
+        return status if isinstance(status, int) else None
+
+    def is_retryable(self, exception: BaseException) -> bool:
+        status = self.get_status(exception)
+        if status is not None:
+            return status in self.retry_statuses
+        return isinstance(exception, _TRANSIENT_ERRORS)
+
+    def get_retry_after(self, exception: BaseException) -> Optional[float]:
+        """
+        How many seconds the response which caused `exception` asked to wait before retrying, if it did.
+        """
+        headers = getattr(getattr(exception, "response", None), "headers", None)
+        if not headers or self.get_status(exception) is None:
+            return None
+
+        retry_after = headers.get("Retry-After")
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def before_query(self) -> bool:
+        """
+        Returns whether the query is testing the API for the circuit breaker, see `CircuitBreaker.before_query`.
+        """
+        if self.circuit_breaker is None:
+            return False
+        return self.circuit_breaker.before_query()
+
+    def record_interrupted(self, testing: bool):
+        """
+        Tell the circuit breaker an attempt ended without an outcome, e.g. because it was cancelled.
+        """
+        if testing and self.circuit_breaker is not None:
+            self.circuit_breaker.release_test()
+
+    def record_outcome(self, exception: Optional[BaseException]):
+        """
+        Tell the circuit breaker how an attempt went: it succeeded if there's no exception, or if the API responded
+        with a permanent error, since the API is evidently up.
+        """
+        if self.circuit_breaker is None or isinstance(exception, CircuitOpenError):
+            return
+        if exception is not None and self.is_retryable(exception):
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def should_give_up(self, exception: BaseException) -> bool:
+        if isinstance(exception, CircuitOpenError):
+            return True
+        if not self.is_retryable(exception):
+            logger.info(
+                f"Not retrying query, as the error isn't transient: {exception}"
+            )
+            return True
+
+        retry_after = self.get_retry_after(exception)
+        if retry_after is not None and retry_after > self.max_retry_after:
+            logger.warning(
+                f"Not retrying query, as the API asked to wait {retry_after:.0f}s, "
+                f"longer than the maximum of {self.max_retry_after:.0f}s"
+            )
+            return True
+        return False
+
+    def wait_gen(self, delays: Iterator[float]):
+        """
+        A `backoff` wait generator, which waits as long as a `Retry-After` header asks, or otherwise as long as the
+        next of `delays` (with jitter).
+        """
+        delays.send(None)
+        exception = yield
+        while True:
+            delay = next(delays)
+            retry_after = self.get_retry_after(exception)
+            if retry_after is not None:
+                logger.info(
+                    f"Waiting {retry_after:.1f}s before retrying, as asked by the API"
+                )
+                exception = yield retry_after
+            else:
+                exception = yield backoff.full_jitter(delay)
@@ -0,0 +1,92 @@
+"""
+A graph of the routes (origin -> destination airport pairs) seen in fare responses.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Iterable, Optional
+
+from ryanair.types import Flight
+
+
+def _atomic_write(path: str, text: str):
+    """
+    Write to a temporary file first and then move it into place, so a crash can't leave a half-written file behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "w", encoding="utf8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class RouteGraph:
+    """
+    Records every route seen in fare responses, so that scans can query only the routes which exist.
+    Pass one to `Ryanair(route_graph=...)` to have it filled in automatically.
+    If a path is given, previously saved routes are loaded from it, and `save` writes them back.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+
+        # {origin: {destination: time last seen}}
+        self._routes = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf8") as f:
+                self._routes = json.load(f)
+
+    def add_route(self, origin: str, destination: str, seen_at: Optional[float] = None):
+        seen_at = time.time() if seen_at is None else seen_at
+        with self._lock:
+            destinations = self._routes.setdefault(origin, {})
+            destinations[destination] = max(destinations.get(destination, 0), seen_at)
+
+    def add_flights(self, flights: Iterable[Flight]):
+        seen_at = time.time()
+        for flight in flights:
+            self.add_route(flight.origin, flight.destination, seen_at)
+
+    def has_route(self, origin: str, destination: str) -> bool:
+        with self._lock:
+            return destination in self._routes.get(origin, ())
+
+    def destinations(self, origin: str) -> set[str]:
+        with self._lock:
+            return set(self._routes.get(origin, ()))
+
+    def origins(self, destination: str) -> set[str]:
+        with self._lock:
+            return {
+                origin
+                for origin, destinations in self._routes.items()
+                if destination in destinations
+            }
+
+    def filter_destinations(self, origin: str, candidates: Iterable[str]) -> list[str]:
+        """
+        The candidate destinations which are known to be served from `origin`, in their original order.
+        """
+        destinations = self.destinations(origin)
+        return [candidate for candidate in candidates if candidate in destinations]
+
+    def last_seen(self, origin: str, destination: str) -> Optional[float]:
+        with self._lock:
+            return self._routes.get(origin, {}).get(destination)
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        with self._lock:
+            routes = json.dumps(self._routes)
+        _atomic_write(path, routes)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(destinations) for destinations in self._routes.values())
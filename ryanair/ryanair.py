@@ -4,13 +4,36 @@ This is done directly through Ryanair's API, and does not require an API key.
 """
 import logging
 import sys
-from datetime import datetime, date, time
-from typing import Union, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, date, time, timedelta
+from itertools import islice, product
+from time import perf_counter, sleep
+from typing import Union, Optional, Iterable, Callable, Iterator
 
 import backoff
 
-from ryanair.SessionManager import SessionManager
-from ryanair.types import Flight, Trip
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from ryanair.SessionManager import BaseSessionManager, SessionManager
+from ryanair.cache import Cache, make_cache_key
+from ryanair.coalesce import SingleFlight
+from ryanair.concurrency import AIMDController
+from ryanair.metrics import Metrics, get_endpoint
+from ryanair.ratelimit import RateLimiter
+from ryanair.retry import RetryPolicy, CircuitOpenError
+from ryanair.routes import RouteGraph
+from ryanair.types import (
+    Flight,
+    Trip,
+    BatchResult,
+    FlightTable,
+    FareView,
+    FlexibleSearchResult,
+)
 
 logger = logging.getLogger("ryanair")
 if not logger.handlers:
@@ -30,18 +53,43 @@ class RyanairException(Exception):
         super().__init__(f"Ryanair API: {message}")
 
 
-# noinspection PyBroadException
-class Ryanair:
+class _BaseRyanair:
+    """
+    Query construction and response parsing shared by the sync and async clients.
+    """
+
     BASE_SERVICES_API_URL = "https://services-api.ryanair.com/farfnd/v4/"
 
-    def __init__(self, currency: Optional[str] = None):
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        cache: Optional[Cache] = None,
+        route_graph: Optional[RouteGraph] = None,
+        metrics: Optional[Metrics] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_controller: Optional[AIMDController] = None,
+    ):
         self.currency = currency
-
+        self.cache = cache
+        self.route_graph = route_graph
+        self.metrics = metrics
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.concurrency_controller = concurrency_controller
+
+        # Clients may be shared between threads, so counters are only updated while holding this
+        self._stats_lock = threading.Lock()
         self._num_queries = 0
-        self.session_manager = SessionManager()
-        self.session = self.session_manager.get_session()
-
-    def get_cheapest_flights(
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._coalesced_queries = 0
+        self._rate_limit_wait = 0.0
+        self._in_flight = 0
+        self._airport_full_names = {}
+        self._flight_numbers = {}
+
+    def _get_cheapest_flights_params(
         self,
         airport: str,
         date_from: Union[datetime, date, str],
@@ -53,7 +101,7 @@ class Ryanair:
         max_price: Optional[int] = None,
         destination_airport: Optional[str] = None,
     ):
-        query_url = "".join((Ryanair.BASE_SERVICES_API_URL, "oneWayFares"))
+        query_url = "".join((self.BASE_SERVICES_API_URL, "oneWayFares"))
 
         params = {
             "departureAirportIataCode": airport,
@@ -73,16 +121,9 @@ class Ryanair:
         if custom_params:
             params.update(custom_params)
 
-        response = self._retryable_query(query_url, params)["fares"]
-
-        if response:
-            return [
-                self._parse_cheapest_flight(flight["outbound"]) for flight in response
-            ]
-
-        return []
+        return query_url, params
 
-    def get_cheapest_return_flights(
+    def _get_cheapest_return_flights_params(
         self,
         source_airport: str,
         date_from: Union[datetime, date, str],
@@ -98,7 +139,7 @@ class Ryanair:
         max_price: Optional[int] = None,
         destination_airport: Optional[str] = None,
     ):
-        query_url = "".join((Ryanair.BASE_SERVICES_API_URL, "roundTripFares"))
+        query_url = "".join((self.BASE_SERVICES_API_URL, "roundTripFares"))
 
         params = {
             "departureAirportIataCode": source_airport,
@@ -130,18 +171,174 @@ class Ryanair:
         if custom_params:
             params.update(custom_params)
 
-        response = self._retryable_query(query_url, params)["fares"]
+        return query_url, params
+
+    def _parse_cheapest_flights(
+        self,
+        fares,
+        as_table: bool = False,
+        predicate: Optional[Callable[[FareView], bool]] = None,
+    ):
+        if self.metrics is None:
+            return self._build_cheapest_flights(fares, as_table, predicate)
+
+        start = perf_counter()
+        flights = self._build_cheapest_flights(fares, as_table, predicate)
+        self.metrics.on_parse("oneWayFares", perf_counter() - start, len(flights))
+        return flights
+
+    def _build_cheapest_flights(
+        self,
+        fares,
+        as_table: bool = False,
+        predicate: Optional[Callable[[FareView], bool]] = None,
+    ):
+        if fares and self.route_graph is not None:
+            self._record_routes(fare["outbound"] for fare in fares)
+
+        if fares and predicate is not None:
+            fares = [fare for fare in fares if predicate(FareView(fare["outbound"]))]
+
+        if as_table:
+            return FlightTable(
+                self._parse_cheapest_flight(flight["outbound"])
+                for flight in fares or ()
+            )
 
-        if response:
+        if fares:
+            return [self._parse_cheapest_flight(flight["outbound"]) for flight in fares]
+
+        return []
+
+    def _parse_cheapest_return_flights(
+        self,
+        fares,
+        predicate: Optional[Callable[[FareView, FareView], bool]] = None,
+    ):
+        if self.metrics is None:
+            return self._build_cheapest_return_flights(fares, predicate)
+
+        start = perf_counter()
+        trips = self._build_cheapest_return_flights(fares, predicate)
+        self.metrics.on_parse("roundTripFares", perf_counter() - start, len(trips))
+        return trips
+
+    def _build_cheapest_return_flights(
+        self,
+        fares,
+        predicate: Optional[Callable[[FareView, FareView], bool]] = None,
+    ):
+        if fares and self.route_graph is not None:
+            self._record_routes(
+                flight
+                for trip in fares
+                for flight in (trip["outbound"], trip["inbound"])
+            )
+
+        if fares and predicate is not None:
+            fares = [
+                trip
+                for trip in fares
+                if predicate(FareView(trip["outbound"]), FareView(trip["inbound"]))
+            ]
+
+        if fares:
             return [
                 self._parse_cheapest_return_flights_as_trip(
                     trip["outbound"], trip["inbound"]
                 )
-                for trip in response
+                for trip in fares
             ]
         else:
             return []
 
+    def _record_routes(self, fares):
+        for fare in fares:
+            self.route_graph.add_route(
+                fare["departureAirport"]["iataCode"], fare["arrivalAirport"]["iataCode"]
+            )
+
+    @staticmethod
+    def _split_date_range(
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        window_days: int,
+    ):
+        """
+        Split an inclusive date range into consecutive inclusive windows of at most `window_days` days.
+        """
+        if window_days < 1:
+            raise ValueError(f"window_days must be at least 1, not {window_days}")
+        start = date.fromisoformat(_BaseRyanair._format_date_for_api(date_from))
+        end = date.fromisoformat(_BaseRyanair._format_date_for_api(date_to))
+
+        windows = []
+        while start <= end:
+            window_end = min(start + timedelta(days=window_days - 1), end)
+            windows.append((start, window_end))
+            start = window_end + timedelta(days=1)
+        return windows
+
+    @staticmethod
+    def _merge_by_destination_and_day(results: Iterable[list]):
+        """
+        Merge lists of flights (or trips, keyed on their outbound flight) into
+        `{destination: {departure date: [flights]}}`, dropping duplicates.
+        """
+        merged = {}
+        seen = set()
+        for result in results:
+            for item in result:
+                if isinstance(item, Trip):
+                    flight = item.outbound
+                    key = (
+                        item.outbound.flightNumber,
+                        item.outbound.departureTime,
+                        item.inbound.flightNumber,
+                        item.inbound.departureTime,
+                    )
+                else:
+                    flight = item
+                    key = (item.flightNumber, item.departureTime)
+
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.setdefault(flight.destination, {}).setdefault(
+                    flight.departureTime.date(), []
+                ).append(item)
+        return merged
+
+    def _get_cached_response(self, url, params):
+        if self.cache is None:
+            return None
+
+        response = self.cache.get(url, params)
+        if response is None:
+            with self._stats_lock:
+                self._cache_misses += 1
+        else:
+            with self._stats_lock:
+                self._cache_hits += 1
+        return response
+
+    def _cache_response(self, url, params, response):
+        if self.cache is not None:
+            self.cache.set(url, params, response)
+
+    def invalidate_cache(
+        self, url: Optional[str] = None, params: Optional[dict] = None
+    ):
+        if self.cache is not None:
+            self.cache.invalidate(url, params)
+
+    @staticmethod
+    def _parse_json(response):
+        content = response.content
+        if orjson is not None and isinstance(content, (bytes, bytearray)):
+            return orjson.loads(content)
+        return response.json()
+
     @staticmethod
     def _get_backoff_type():
         if "unittest" in sys.modules.keys():
@@ -149,23 +346,75 @@ class Ryanair:
 
         return backoff.expo()
 
-    @staticmethod
-    def _on_query_error(e):
-        logger.exception(f"Gave up retrying query, last exception was {e}")
-
-    @backoff.on_exception(
-        _get_backoff_type,
-        Exception,
-        max_tries=5,
-        logger=logger,
-        raise_on_giveup=True,
-        on_giveup=_on_query_error,
-    )
-    def _retryable_query(self, url, params=None):
-        self._num_queries += 1
-        response = self.session.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+    def _with_retries(self, query):
+        """
+        Wrap `query(url, params)` so that failed attempts are retried as this client's `retry_policy` decides.
+        """
+        return backoff.on_exception(
+            lambda: self.retry_policy.wait_gen(self._get_backoff_type()),
+            Exception,
+            max_tries=lambda: self.retry_policy.max_tries,
+            jitter=None,  # Applied by the policy, so that Retry-After waits aren't shortened
+            giveup=lambda e: self.retry_policy.should_give_up(e),
+            logger=logger,
+            raise_on_giveup=True,
+            on_success=self._on_query_success,
+            on_backoff=self._on_query_retry,
+            on_giveup=self._on_query_error,
+        )(query)
+
+    def _on_query_success(self, details):
+        self.retry_policy.record_outcome(None)
+
+    def _on_query_retry(self, details):
+        self.retry_policy.record_outcome(details["exception"])
+        if self.metrics is not None:
+            self.metrics.on_retry(
+                get_endpoint(details["args"][0]),
+                details["tries"],
+                details["exception"],
+            )
+
+    def _on_query_error(self, e):
+        exception = e["exception"]
+        # Permanent errors were never retried, and were already logged when the policy declined to retry them
+        if not isinstance(exception, CircuitOpenError) and (
+            e["tries"] > 1 or self.retry_policy.is_retryable(exception)
+        ):
+            logger.exception(f"Gave up retrying query, last exception was {e}")
+        self.retry_policy.record_outcome(e["exception"])
+        if self.metrics is not None:
+            self.metrics.on_give_up(
+                get_endpoint(e["args"][0]), e["tries"], e["exception"]
+            )
+
+    def _reserve_rate_limit(self, url) -> float:
+        wait = self.rate_limiter.reserve()
+        self._record_rate_limit_wait(url, wait)
+        return wait
+
+    def _record_rate_limit_wait(self, url, wait: float):
+        with self._stats_lock:
+            self._rate_limit_wait += wait
+        if self.metrics is not None:
+            self.metrics.on_rate_limit(get_endpoint(url), wait)
+
+    def _record_response(self, url, response, seconds):
+        if self.metrics is not None:
+            self._observe_response(url, response, seconds)
+        if self.concurrency_controller is not None:
+            status = getattr(response, "status_code", None)
+            if isinstance(status, int):
+                self.concurrency_controller.record(seconds, status)
+
+    def _observe_response(self, url, response, seconds):
+        content = response.content
+        self.metrics.on_request(
+            get_endpoint(url),
+            seconds,
+            len(content) if isinstance(content, (bytes, bytearray)) else 0,
+            getattr(response, "status_code", None),
+        )
 
     def _parse_cheapest_flight(self, flight):
         currency = flight["price"]["currencyCode"]
@@ -175,25 +424,33 @@ class Ryanair:
             )
         return Flight(
             origin=flight["departureAirport"]["iataCode"],
-            originFull=", ".join(
-                (
-                    flight["departureAirport"]["name"],
-                    flight["departureAirport"]["countryName"],
-                )
-            ),
+            originFull=self._get_airport_full_name(flight["departureAirport"]),
             destination=flight["arrivalAirport"]["iataCode"],
-            destinationFull=", ".join(
-                (
-                    flight["arrivalAirport"]["name"],
-                    flight["arrivalAirport"]["countryName"],
-                )
-            ),
+            destinationFull=self._get_airport_full_name(flight["arrivalAirport"]),
             departureTime=datetime.fromisoformat(flight["departureDate"]),
-            flightNumber=f"{flight['flightNumber'][:2]} {flight['flightNumber'][2:]}",
+            flightNumber=self._format_flight_number(flight["flightNumber"]),
             price=flight["price"]["value"],
             currency=currency,
+            arrivalTime=datetime.fromisoformat(flight["arrivalDate"])
+            if flight.get("arrivalDate")
+            else None,
         )
 
+    def _get_airport_full_name(self, airport):
+        # Responses repeat the same few airports many times, so only build (and store) each name once
+        full_name = self._airport_full_names.get(airport["iataCode"])
+        if full_name is None:
+            full_name = ", ".join((airport["name"], airport["countryName"]))
+            self._airport_full_names[airport["iataCode"]] = full_name
+        return full_name
+
+    def _format_flight_number(self, flight_number):
+        formatted = self._flight_numbers.get(flight_number)
+        if formatted is None:
+            formatted = f"{flight_number[:2]} {flight_number[2:]}"
+            self._flight_numbers[flight_number] = formatted
+        return formatted
+
     def _parse_cheapest_return_flights_as_trip(self, outbound, inbound):
         outbound = self._parse_cheapest_flight(outbound)
         inbound = self._parse_cheapest_flight(inbound)
@@ -226,3 +483,521 @@ class Ryanair:
     @property
     def num_queries(self) -> __init__:
         return self._num_queries
+
+    @property
+    def cache_hits(self) -> int:
+        return self._cache_hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self._cache_misses
+
+    @property
+    def coalesced_queries(self) -> int:
+        return self._coalesced_queries
+
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        """
+        How many queries the concurrency controller currently allows in flight, if there is one.
+        """
+        if self.concurrency_controller is None:
+            return None
+        return self.concurrency_controller.limit
+
+    @property
+    def rate_limit_wait(self) -> float:
+        """
+        The total time, in seconds, which queries have spent waiting for the rate limiter.
+        """
+        return self._rate_limit_wait
+
+
+# noinspection PyBroadException
+class Ryanair(_BaseRyanair):
+    DEFAULT_MAX_WORKERS = 10
+
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache: Optional[Cache] = None,
+        route_graph: Optional[RouteGraph] = None,
+        coalesce_queries: bool = True,
+        metrics: Optional[Metrics] = None,
+        session_manager: Optional[BaseSessionManager] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_controller: Optional[AIMDController] = None,
+    ):
+        """
+        :param max_workers: How many threads the concurrent methods use. Their own `max_workers` arguments are capped
+        at this, so that each thread always has a connection in the pool.
+        :param session_manager: The HTTP transport to query with, see `ryanair.transports`. By default, a
+        `requests` session with a connection pool of `max_workers` connections.
+        :param retry_policy: Which failed queries to retry and how, see `ryanair.retry`. By default, transient errors
+        are retried up to 5 times. Pass a `RetryPolicy` with a `CircuitBreaker` to fail fast after repeated failures.
+        :param rate_limiter: Paces queries from all threads using this client, see `ryanair.ratelimit`.
+        :param concurrency_controller: Adapts how many of the `max_workers` threads may have a query in flight at
+        once, see `ryanair.concurrency`.
+        """
+        super().__init__(
+            currency,
+            cache,
+            route_graph,
+            metrics,
+            retry_policy,
+            rate_limiter,
+            concurrency_controller,
+        )
+
+        self.max_workers = max_workers
+        self._single_flight = SingleFlight() if coalesce_queries else None
+        self.session_manager = session_manager or SessionManager(
+            pool_maxsize=max_workers
+        )
+        self.session = self.session_manager.get_session()
+        self._retryable_query = self._with_retries(self._query_once)
+        self._in_flight_changed = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.session_manager.close()
+
+    def get_cheapest_flights(
+        self,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        departure_time_from: Union[str, time] = "00:00",
+        departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+        as_table: bool = False,
+        predicate: Optional[Callable[[FareView], bool]] = None,
+    ):
+        query_url, params = self._get_cheapest_flights_params(
+            airport,
+            date_from,
+            date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            departure_time_from=departure_time_from,
+            departure_time_to=departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+
+        response = self._query(query_url, params)["fares"]
+
+        return self._parse_cheapest_flights(response, as_table, predicate)
+
+    def get_cheapest_return_flights(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        outbound_departure_time_from: Union[str, time] = "00:00",
+        outbound_departure_time_to: Union[str, time] = "23:59",
+        inbound_departure_time_from: Union[str, time] = "00:00",
+        inbound_departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+        predicate: Optional[Callable[[FareView, FareView], bool]] = None,
+    ):
+        query_url, params = self._get_cheapest_return_flights_params(
+            source_airport,
+            date_from,
+            date_to,
+            return_date_from,
+            return_date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            outbound_departure_time_from=outbound_departure_time_from,
+            outbound_departure_time_to=outbound_departure_time_to,
+            inbound_departure_time_from=inbound_departure_time_from,
+            inbound_departure_time_to=inbound_departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+
+        response = self._query(query_url, params)["fares"]
+
+        return self._parse_cheapest_return_flights(response, predicate)
+
+    def get_cheapest_flights_many(
+        self,
+        airports: Iterable[str],
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> BatchResult:
+        """
+        Run `get_cheapest_flights` for each origin airport concurrently.
+        Any other keyword arguments are passed through to `get_cheapest_flights`.
+        Failures are collected per origin in `BatchResult.errors` rather than aborting the batch.
+        """
+        return self.run_many(
+            lambda airport: self.get_cheapest_flights(
+                airport, date_from, date_to, **kwargs
+            ),
+            airports,
+            max_workers,
+        )
+
+    def get_cheapest_return_flights_many(
+        self,
+        source_airports: Iterable[str],
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> BatchResult:
+        """
+        Run `get_cheapest_return_flights` for each origin airport concurrently.
+        Any other keyword arguments are passed through to `get_cheapest_return_flights`.
+        Failures are collected per origin in `BatchResult.errors` rather than aborting the batch.
+        """
+        return self.run_many(
+            lambda airport: self.get_cheapest_return_flights(
+                airport, date_from, date_to, return_date_from, return_date_to, **kwargs
+            ),
+            source_airports,
+            max_workers,
+        )
+
+    def run_many(
+        self, query: Callable, items: Iterable, max_workers: Optional[int] = None
+    ) -> BatchResult:
+        """
+        Run `query(item)` for each distinct item concurrently, on at most `max_workers` (and this client's
+        `max_workers`) threads. Failures are collected per item in `BatchResult.errors` rather than aborting the batch.
+        """
+        items = list(dict.fromkeys(items))
+        result = BatchResult(results={}, errors={})
+        if not items:
+            return result
+
+        max_workers = min(self._get_max_workers(max_workers), len(items))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {item: executor.submit(query, item) for item in items}
+            for item, future in futures.items():
+                try:
+                    result.results[item] = future.result()
+                except Exception as e:
+                    result.errors[item] = e
+
+        return result
+
+    def get_cheapest_flights_calendar(
+        self,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        window_days: int = 1,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> dict[str, dict[date, list[Flight]]]:
+        """
+        Split the date range into windows of `window_days` days, query them concurrently, and merge the results into
+        `{destination: {departure date: [flights]}}`.
+        Any other keyword arguments are passed through to `get_cheapest_flights`.
+        """
+        batch = self.run_many(
+            lambda window: self.get_cheapest_flights(
+                airport, window[0], window[1], **kwargs
+            ),
+            self._split_date_range(date_from, date_to, window_days),
+            max_workers,
+        )
+        for error in batch.errors.values():
+            raise error
+
+        return self._merge_by_destination_and_day(batch.results.values())
+
+    def get_cheapest_return_flights_calendar(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        window_days: int = 1,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> dict[str, dict[date, list[Trip]]]:
+        """
+        Split the outbound date range into windows of `window_days` days, query them concurrently, and merge the
+        results into `{destination: {outbound departure date: [trips]}}`.
+        Any other keyword arguments are passed through to `get_cheapest_return_flights`.
+        """
+        batch = self.run_many(
+            lambda window: self.get_cheapest_return_flights(
+                source_airport,
+                window[0],
+                window[1],
+                return_date_from,
+                return_date_to,
+                **kwargs,
+            ),
+            self._split_date_range(date_from, date_to, window_days),
+            max_workers,
+        )
+        for error in batch.errors.values():
+            raise error
+
+        return self._merge_by_destination_and_day(batch.results.values())
+
+    def get_cheapest_flexible_return_flights(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        min_nights: int,
+        max_nights: int,
+        destination_airport: Optional[str] = None,
+        destination_country: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> FlexibleSearchResult:
+        """
+        The cheapest return trip to each destination for each stay of `min_nights` to `max_nights` nights,
+        departing between the given dates.
+
+        Without a destination airport, this needs one return query per outbound day and stay length. With one,
+        it can instead use one-way queries for each outbound and inbound day, and pair them up locally;
+        whichever plan needs fewer queries is used. The queries are run concurrently.
+        """
+        days = [day for day, _ in self._split_date_range(date_from, date_to, 1)]
+        nights = range(min_nights, max_nights + 1)
+        if not days or not nights:
+            return FlexibleSearchResult(trips={}, num_queries=0)
+
+        return_trip_queries = [
+            (day, day + timedelta(days=n)) for day in days for n in nights
+        ]
+        one_way_queries = None
+        if destination_airport:
+            return_days = [
+                day
+                for day, _ in self._split_date_range(
+                    days[0] + timedelta(days=min_nights),
+                    days[-1] + timedelta(days=max_nights),
+                    1,
+                )
+            ]
+            one_way_queries = [
+                (source_airport, destination_airport, day) for day in days
+            ] + [(destination_airport, source_airport, day) for day in return_days]
+
+        trips = {}
+        if one_way_queries is not None and len(one_way_queries) < len(
+            return_trip_queries
+        ):
+            queries = one_way_queries
+            batch = self.run_many(
+                lambda query: self.get_cheapest_flights(
+                    query[0], query[2], query[2], destination_airport=query[1]
+                ),
+                queries,
+                max_workers,
+            )
+            for error in batch.errors.values():
+                raise error
+
+            flights = batch.results
+            for day in days:
+                for outbound in flights[source_airport, destination_airport, day]:
+                    for n in nights:
+                        return_day = day + timedelta(days=n)
+                        for inbound in flights[
+                            destination_airport, source_airport, return_day
+                        ]:
+                            self._keep_cheapest_trip(
+                                trips,
+                                n,
+                                Trip(
+                                    totalPrice=outbound.price + inbound.price,
+                                    outbound=outbound,
+                                    inbound=inbound,
+                                ),
+                            )
+        else:
+            queries = return_trip_queries
+            batch = self.run_many(
+                lambda query: self.get_cheapest_return_flights(
+                    source_airport,
+                    query[0],
+                    query[0],
+                    query[1],
+                    query[1],
+                    destination_country=destination_country,
+                    destination_airport=destination_airport,
+                ),
+                queries,
+                max_workers,
+            )
+            for error in batch.errors.values():
+                raise error
+
+            for result in batch.results.values():
+                for trip in result:
+                    self._keep_cheapest_trip(
+                        trips,
+                        (
+                            trip.inbound.departureTime.date()
+                            - trip.outbound.departureTime.date()
+                        ).days,
+                        trip,
+                    )
+
+        return FlexibleSearchResult(trips=trips, num_queries=len(queries))
+
+    @staticmethod
+    def _keep_cheapest_trip(trips: dict, nights: int, trip: Trip):
+        by_nights = trips.setdefault(trip.outbound.destination, {})
+        if nights not in by_nights or trip.totalPrice < by_nights[nights].totalPrice:
+            by_nights[nights] = trip
+
+    def iter_cheapest_flights(
+        self,
+        airports: Iterable[str],
+        date_windows: Iterable[tuple],
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[Flight]:
+        """
+        Query every combination of origin airport and `(date_from, date_to)` window concurrently,
+        yielding flights as each response arrives.
+        At most `max_workers` queries are in flight at once, and the first failed query is raised.
+        Any other keyword arguments are passed through to `get_cheapest_flights`.
+        """
+        return self._iter_concurrently(
+            lambda query: self.get_cheapest_flights(query[0], *query[1], **kwargs),
+            product(airports, date_windows),
+            max_workers,
+        )
+
+    def iter_cheapest_return_flights(
+        self,
+        source_airports: Iterable[str],
+        date_windows: Iterable[tuple],
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[Trip]:
+        """
+        Query every combination of origin airport and `(date_from, date_to, return_date_from, return_date_to)` window
+        concurrently, yielding trips as each response arrives.
+        At most `max_workers` queries are in flight at once, and the first failed query is raised.
+        Any other keyword arguments are passed through to `get_cheapest_return_flights`.
+        """
+        return self._iter_concurrently(
+            lambda query: self.get_cheapest_return_flights(
+                query[0], *query[1], **kwargs
+            ),
+            product(source_airports, date_windows),
+            max_workers,
+        )
+
+    def _get_max_workers(self, max_workers: Optional[int]) -> int:
+        # More threads than the connection pool holds would each open (and then discard) a connection of their own
+        return min(max_workers or self.max_workers, self.max_workers)
+
+    def _iter_concurrently(
+        self, query: Callable, items: Iterable, max_workers: Optional[int]
+    ):
+        max_workers = self._get_max_workers(max_workers)
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {
+                executor.submit(query, item) for item in islice(items, max_workers)
+            }
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                # Top up from the (lazy) items so that only max_workers results are ever held at once
+                in_flight.update(
+                    executor.submit(query, item) for item in islice(items, len(done))
+                )
+                for future in done:
+                    yield from future.result()
+
+    def _query(self, url, params=None):
+        response = self._get_cached_response(url, params)
+        if response is not None:
+            return response
+
+        if self._single_flight is None:
+            return self._fetch(url, params)
+
+        # Identical queries already in flight on other threads share that query's response
+        response, shared = self._single_flight.do(
+            make_cache_key(url, params), lambda: self._fetch(url, params)
+        )
+        if shared:
+            with self._stats_lock:
+                self._coalesced_queries += 1
+        return response
+
+    def _fetch(self, url, params=None):
+        response = self._retryable_query(url, params)
+        self._cache_response(url, params, response)
+        return response
+
+    def _query_once(self, url, params=None):
+        testing = self.retry_policy.before_query()
+        try:
+            if self.rate_limiter is not None:
+                wait = self._reserve_rate_limit(url)
+                if wait:
+                    sleep(wait)
+            with self._stats_lock:
+                self._num_queries += 1
+            if self.metrics is None and self.concurrency_controller is None:
+                response = self.session.get(url, params=params)
+            else:
+                response = self._controlled_get(url, params)
+            response.raise_for_status()
+            return self._parse_json(response)
+        except Exception:
+            raise
+        except BaseException:
+            # Retries only see an Exception, so nothing else would tell the circuit breaker this attempt is over
+            self.retry_policy.record_interrupted(testing)
+            raise
+
+    def _controlled_get(self, url, params=None):
+        controller = self.concurrency_controller
+        if controller is not None:
+            with self._in_flight_changed:
+                self._in_flight_changed.wait_for(
+                    lambda: self._in_flight < controller.limit
+                )
+                self._in_flight += 1
+
+        start = perf_counter()
+        try:
+            response = self.session.get(url, params=params)
+        except Exception:
+            if controller is not None:
+                controller.record(perf_counter() - start, None)
+            raise
+        finally:
+            if controller is not None:
+                with self._in_flight_changed:
+                    self._in_flight -= 1
+                    self._in_flight_changed.notify_all()
+        self._record_response(url, response, perf_counter() - start)
+        return response
@@ -0,0 +1,214 @@
+"""
+Alternatives to the default `requests` transport, which can be passed to `Ryanair(session_manager=...)`:
+an `httpx` transport which can multiplex queries over HTTP/2, and transports which record responses to a file and
+replay them later, for running offline.
+"""
+import json
+import logging
+import threading
+from typing import Optional
+
+import requests
+
+from ryanair.SessionManager import (
+    BaseSessionManager,
+    SessionManager,
+    _CookieLifecycle,
+)
+from ryanair.cache import make_cache_key
+from ryanair.routes import _atomic_write
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+logger = logging.getLogger("ryanair")
+
+
+class _HttpxCookieSession:
+    """
+    Like `CookieSession`, but for an `httpx.Client`.
+    """
+
+    def __init__(self, client, bootstrap_url: str, max_age: Optional[float] = None):
+        self.client = client
+        self.bootstrap_url = bootstrap_url
+        self._cookie_lifecycle = _CookieLifecycle(self._fetch_cookies, max_age)
+
+    @property
+    def cookies(self):
+        return self.client.cookies
+
+    def expires_within(self, seconds: float) -> bool:
+        return self._cookie_lifecycle.expires_within(seconds)
+
+    def refresh(self):
+        self._cookie_lifecycle.refresh()
+
+    def _fetch_cookies(self):
+        # Visit main website to get session cookies
+        self.client.get(self.bootstrap_url)
+        return self.client.cookies.jar
+
+    def get(self, url, params=None, **kwargs):
+        return self._cookie_lifecycle.send(
+            lambda: self.client.get(url, params=params, **kwargs)
+        )
+
+    def close(self):
+        self.client.close()
+
+
+class HttpxSessionManager(BaseSessionManager):
+    """
+    Uses a synchronous `httpx.Client`. With `http2=True`, concurrent queries are multiplexed over a few HTTP/2
+    connections instead of each needing their own.
+    """
+
+    DEFAULT_MAX_CONNECTIONS = 10
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        http2: bool = True,
+        keepalive_expiry: float = 5.0,
+        max_age: Optional[float] = None,
+    ):
+        """
+        :param max_age: How many seconds to use the session cookies for at most, even if they haven't expired.
+        """
+        if httpx is None:
+            raise ImportError(
+                "HttpxSessionManager requires httpx, install it with `pip install ryanair-py[http2]`"
+            )
+
+        client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            follow_redirects=True,
+        )
+        self.session = _HttpxCookieSession(
+            client, self.BASE_SITE_FOR_SESSION_URL, max_age
+        )
+
+    def _update_session_cookie(self):
+        self.session.refresh()
+
+    def get_session(self):
+        return self.session
+
+    def close(self):
+        self.session.close()
+
+
+class MissingRecordingError(LookupError):
+    pass
+
+
+class ReplayResponse:
+    """
+    A recorded response, with the parts of the `requests.Response` interface which the client uses.
+    """
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: dict):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} Error (replayed) for url: {self.url}",
+                response=self,
+            )
+
+
+class _RecordingSession:
+    def __init__(self, session, manager: "RecordingSessionManager"):
+        self._session = session
+        self._manager = manager
+
+    def get(self, url, params=None, **kwargs):
+        response = self._session.get(url, params=params, **kwargs)
+        self._manager.record(url, params, response)
+        return response
+
+
+class RecordingSessionManager(BaseSessionManager):
+    """
+    Records every response received through another transport (by default a `SessionManager`) to `path`, for
+    `ReplaySessionManager` to replay later. Recordings are written by `save`, and when the client is closed.
+    """
+
+    def __init__(self, path: str, session_manager: Optional[BaseSessionManager] = None):
+        self.path = path
+        self.session_manager = session_manager or SessionManager()
+
+        self._recordings = {}
+        self._lock = threading.Lock()
+        self.session = _RecordingSession(self.session_manager.get_session(), self)
+
+    def record(self, url: str, params: Optional[dict], response):
+        recording = {
+            "url": url,
+            "status_code": response.status_code,
+            "content": response.content.decode("utf8"),
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+        }
+        with self._lock:
+            self._recordings[make_cache_key(url, params)] = recording
+
+    def get_session(self):
+        return self.session
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        with self._lock:
+            recordings = json.dumps(self._recordings, indent=1)
+        _atomic_write(path, recordings)
+
+    def close(self):
+        self.save()
+        self.session_manager.close()
+
+
+class _ReplaySession:
+    def __init__(self, recordings: dict):
+        self._recordings = recordings
+
+    def get(self, url, params=None, **kwargs):
+        recording = self._recordings.get(make_cache_key(url, params))
+        if recording is None:
+            raise MissingRecordingError(
+                f"No recorded response for {make_cache_key(url, params)}"
+            )
+        return ReplayResponse(
+            recording["url"],
+            recording["status_code"],
+            recording["content"].encode("utf8"),
+            recording["headers"],
+        )
+
+
+class ReplaySessionManager(BaseSessionManager):
+    """
+    Replays the responses recorded by `RecordingSessionManager`, without making any requests.
+    Queries which weren't recorded raise `MissingRecordingError`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, encoding="utf8") as f:
+            self.session = _ReplaySession(json.load(f))
+
+    def get_session(self):
+        return self.session
@@ -0,0 +1,102 @@
+"""
+Compose return trips locally from one-way fares, without any further queries to the API.
+"""
+from bisect import bisect_left
+from collections import deque
+from datetime import timedelta, datetime
+from typing import Iterable, Optional
+
+from ryanair.types import Flight, Trip
+
+
+def compose_return_trips(
+    outbound: Iterable[Flight],
+    inbound: Iterable[Flight],
+    min_stay: timedelta = timedelta(0),
+    max_stay: Optional[timedelta] = None,
+    open_jaw: bool = False,
+    return_to_any_origin: bool = False,
+) -> list[Trip]:
+    """
+    Pair each outbound flight with the cheapest inbound flight departing between `min_stay` and `max_stay` after it,
+    returning the resulting trips, cheapest first.
+
+    By default the inbound flight must fly back from the outbound flight's destination to its origin.
+    With `open_jaw`, it may depart from any airport, and with `return_to_any_origin`, it may arrive at any airport.
+
+    Inbound flights are grouped by the airports they must match and sorted by departure time, and each group is
+    then swept once with a sliding window minimum, so this costs O(n log n) overall rather than O(n^2).
+    """
+    groups = {}
+    for flight in inbound:
+        groups.setdefault(
+            _group_key(
+                flight.origin, flight.destination, open_jaw, return_to_any_origin
+            ),
+            [],
+        ).append(flight)
+
+    outbound_by_group = {}
+    for flight in outbound:
+        outbound_by_group.setdefault(
+            _group_key(
+                flight.destination, flight.origin, open_jaw, return_to_any_origin
+            ),
+            [],
+        ).append(flight)
+
+    trips = []
+    for key, outbound_flights in outbound_by_group.items():
+        inbound_flights = sorted(
+            groups.get(key, ()), key=lambda flight: flight.departureTime
+        )
+        if not inbound_flights:
+            continue
+        departure_times = [flight.departureTime for flight in inbound_flights]
+
+        # Inbound flights in the current window, with strictly increasing prices from the front
+        window = deque()
+        end = 0
+        for flight in sorted(outbound_flights, key=lambda flight: flight.departureTime):
+            earliest = flight.departureTime + min_stay
+            latest = (
+                flight.departureTime + max_stay
+                if max_stay is not None
+                else datetime.max
+            )
+
+            while end < len(inbound_flights) and departure_times[end] <= latest:
+                price = inbound_flights[end].price
+                while window and inbound_flights[window[-1]].price >= price:
+                    window.pop()
+                window.append(end)
+                end += 1
+
+            start = bisect_left(departure_times, earliest)
+            while window and window[0] < start:
+                window.popleft()
+
+            if window:
+                cheapest = inbound_flights[window[0]]
+                trips.append(
+                    Trip(
+                        totalPrice=flight.price + cheapest.price,
+                        outbound=flight,
+                        inbound=cheapest,
+                    )
+                )
+
+    trips.sort(key=lambda trip: trip.totalPrice)
+    return trips
+
+
+def _group_key(
+    inbound_origin: str,
+    inbound_destination: str,
+    open_jaw: bool,
+    return_to_any_origin: bool,
+):
+    return (
+        None if open_jaw else inbound_origin,
+        None if return_to_any_origin else inbound_destination,
+    )
@@ -1,5 +1,11 @@
-from dataclasses import dataclass
-from datetime import datetime
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional, Union
+
+# Slotted dataclasses use less memory per instance, but need Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 @dataclass
@@ -12,6 +18,8 @@ class Flight:
     originFull: str
     destination: str
     destinationFull: str
+    # Not compared, as the departure time and flight number already identify the flight
+    arrivalTime: Optional[datetime] = field(default=None, compare=False)
 
 
 @dataclass
@@ -19,3 +27,227 @@ class Trip:
     totalPrice: float
     outbound: Flight
     inbound: Flight
+
+
+@dataclass(**_SLOTS)
+class Itinerary:
+    """
+    A journey made up of one or more separately booked flights.
+    """
+
+    totalPrice: float
+    legs: list[Flight]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class FrozenFlight:
+    """
+    An immutable, hashable equivalent of `Flight`, e.g. for use in sets or as a dict key.
+    It also uses less memory than a `Flight`, as it has no instance `__dict__`.
+    """
+
+    departureTime: datetime
+    flightNumber: str
+    price: float
+    currency: str
+    origin: str
+    originFull: str
+    destination: str
+    destinationFull: str
+    arrivalTime: Optional[datetime] = field(default=None, compare=False)
+
+    @classmethod
+    def from_flight(cls, flight: Flight) -> "FrozenFlight":
+        return cls(
+            departureTime=flight.departureTime,
+            flightNumber=flight.flightNumber,
+            price=flight.price,
+            currency=flight.currency,
+            origin=flight.origin,
+            originFull=flight.originFull,
+            destination=flight.destination,
+            destinationFull=flight.destinationFull,
+            arrivalTime=flight.arrivalTime,
+        )
+
+
+@dataclass(frozen=True, **_SLOTS)
+class FrozenTrip:
+    totalPrice: float
+    outbound: FrozenFlight
+    inbound: FrozenFlight
+
+    @classmethod
+    def from_trip(cls, trip: Trip) -> "FrozenTrip":
+        return cls(
+            totalPrice=trip.totalPrice,
+            outbound=FrozenFlight.from_flight(trip.outbound),
+            inbound=FrozenFlight.from_flight(trip.inbound),
+        )
+
+
+class FareView:
+    """
+    A cheap, read-only view of a fare as returned by the API.
+    Passed to `predicate`s so that fares can be filtered before building full `Flight` objects.
+    """
+
+    __slots__ = ("_fare",)
+
+    def __init__(self, fare: dict):
+        self._fare = fare
+
+    @property
+    def price(self) -> float:
+        return self._fare["price"]["value"]
+
+    @property
+    def currency(self) -> str:
+        return self._fare["price"]["currencyCode"]
+
+    @property
+    def origin(self) -> str:
+        return self._fare["departureAirport"]["iataCode"]
+
+    @property
+    def destination(self) -> str:
+        return self._fare["arrivalAirport"]["iataCode"]
+
+    @property
+    def departureTime(self) -> datetime:
+        return datetime.fromisoformat(self._fare["departureDate"])
+
+
+@dataclass
+class BatchResult:
+    results: dict[str, list]
+    errors: dict[str, Exception]
+
+
+@dataclass
+class PriceChange:
+    # One of "new", "removed" or "price"
+    kind: str
+    query: str
+    previous: Optional[Union[Flight, Trip]]
+    current: Optional[Union[Flight, Trip]]
+
+
+@dataclass
+class FlexibleSearchResult:
+    # {destination: {nights: cheapest trip}}
+    trips: dict[str, dict[int, Trip]]
+    num_queries: int
+
+
+class FlightTable:
+    """
+    A compact, columnar container of flights.
+    Prices and departure times are stored in arrays, and airport codes, names and currencies are stored once each,
+    with each flight only holding an index to them. `Flight` objects are only built when they are accessed.
+    """
+
+    _EPOCH = datetime(1970, 1, 1)
+    _NO_TIME = -(2**63)
+
+    def __init__(self, flights: Iterable[Union[Flight, FrozenFlight]] = ()):
+        self._departure_times = array("q")
+        self._arrival_times = array("q")
+        self._prices = array("d")
+        self._flight_numbers = []
+        self._currencies = array("I")
+        self._origins = array("I")
+        self._destinations = array("I")
+
+        # Interned (code, full name) airport pairs and currency codes
+        self._values = []
+        self._value_indices = {}
+
+        self.extend(flights)
+
+    def _intern(self, value) -> int:
+        index = self._value_indices.get(value)
+        if index is None:
+            index = self._value_indices[value] = len(self._values)
+            self._values.append(value)
+        return index
+
+    def append(self, flight: Union[Flight, FrozenFlight]):
+        self._departure_times.append(self._to_seconds(flight.departureTime))
+        self._arrival_times.append(self._to_seconds(flight.arrivalTime))
+        self._prices.append(flight.price)
+        self._flight_numbers.append(sys.intern(flight.flightNumber))
+        self._currencies.append(self._intern(flight.currency))
+        self._origins.append(self._intern((flight.origin, flight.originFull)))
+        self._destinations.append(
+            self._intern((flight.destination, flight.destinationFull))
+        )
+
+    def extend(self, flights: Iterable[Union[Flight, FrozenFlight]]):
+        for flight in flights:
+            self.append(flight)
+
+    @property
+    def prices(self) -> array:
+        return self._prices
+
+    def _to_seconds(self, t: Optional[datetime]) -> int:
+        if t is None:
+            return self._NO_TIME
+        return (t - self._EPOCH) // timedelta(seconds=1)
+
+    def _from_seconds(self, seconds: int) -> Optional[datetime]:
+        if seconds == self._NO_TIME:
+            return None
+        return self._EPOCH + timedelta(seconds=seconds)
+
+    def departure_time(self, i: int) -> datetime:
+        return self._from_seconds(self._departure_times[i])
+
+    def __len__(self):
+        return len(self._prices)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Flight, "FlightTable"]:
+        if isinstance(i, slice):
+            return self._slice(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("FlightTable index out of range")
+
+        origin, origin_full = self._values[self._origins[i]]
+        destination, destination_full = self._values[self._destinations[i]]
+        return Flight(
+            departureTime=self.departure_time(i),
+            flightNumber=self._flight_numbers[i],
+            price=self._prices[i],
+            currency=self._values[self._currencies[i]],
+            origin=origin,
+            originFull=origin_full,
+            destination=destination,
+            destinationFull=destination_full,
+            arrivalTime=self._from_seconds(self._arrival_times[i]),
+        )
+
+    def _slice(self, s: slice) -> "FlightTable":
+        table = FlightTable()
+        table._departure_times = self._departure_times[s]
+        table._arrival_times = self._arrival_times[s]
+        table._prices = self._prices[s]
+        table._flight_numbers = self._flight_numbers[s]
+        table._currencies = self._currencies[s]
+        table._origins = self._origins[s]
+        table._destinations = self._destinations[s]
+        # The sliced flights still index into the same interned values
+        table._values = list(self._values)
+        table._value_indices = dict(self._value_indices)
+        return table
+
+    def __iter__(self) -> Iterator[Flight]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, FlightTable):
+            return NotImplemented
+        return list(self) == list(other)
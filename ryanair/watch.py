@@ -0,0 +1,106 @@
+"""
+Poll fare queries on a schedule and report only what has changed since the last poll.
+"""
+import threading
+from typing import Callable, Optional, Union
+
+from ryanair.ryanair import Ryanair, logger
+from ryanair.types import Flight, Trip, PriceChange
+
+
+class PriceWatcher:
+    """
+    Keeps the last results of each watched query, keyed by flight number and departure time
+    (of both flights, for trips), and reports new and removed flights, and price moves of at least `threshold`
+    since the price was last reported.
+    The first poll of a query reports all of its flights as new.
+    """
+
+    def __init__(self, ryanair: Ryanair, threshold: float = 0):
+        self.ryanair = ryanair
+        self.threshold = threshold
+
+        self._queries = {}
+        self._snapshots = {}
+
+    def watch_flights(self, name: str, *args, **kwargs):
+        """
+        Watch a `get_cheapest_flights` query, with the given arguments, under the given name.
+        """
+        self._queries[name] = lambda: self.ryanair.get_cheapest_flights(*args, **kwargs)
+
+    def watch_return_flights(self, name: str, *args, **kwargs):
+        """
+        Watch a `get_cheapest_return_flights` query, with the given arguments, under the given name.
+        """
+        self._queries[name] = lambda: self.ryanair.get_cheapest_return_flights(
+            *args, **kwargs
+        )
+
+    def unwatch(self, name: str):
+        self._queries.pop(name, None)
+        self._snapshots.pop(name, None)
+
+    def poll(self) -> list[PriceChange]:
+        """
+        Re-run every watched query, returning the changes since the previous poll.
+        If a query fails, its previous results are kept, rather than reporting its flights as removed.
+        """
+        batch = self.ryanair.run_many(
+            lambda name: self._queries[name](), list(self._queries), None
+        )
+        for name, error in batch.errors.items():
+            logger.warning(f"Price watch query {name} failed, skipping: {error}")
+
+        changes = []
+        for name, results in batch.results.items():
+            previous = self._snapshots.get(name, {})
+            current = {self._key(result): result for result in results}
+
+            for key, result in current.items():
+                if key not in previous:
+                    changes.append(PriceChange("new", name, None, result))
+                    continue
+                change = abs(self._price(result) - self._price(previous[key]))
+                if change and change >= self.threshold:
+                    changes.append(PriceChange("price", name, previous[key], result))
+                else:
+                    # Compare against the last reported price, so that small moves can still add up
+                    current[key] = previous[key]
+            for key, result in previous.items():
+                if key not in current:
+                    changes.append(PriceChange("removed", name, result, None))
+
+            self._snapshots[name] = current
+        return changes
+
+    def run(
+        self,
+        interval: float,
+        callback: Callable[[list[PriceChange]], None],
+        stop_event: Optional[threading.Event] = None,
+    ):
+        """
+        Poll every `interval` seconds until `stop_event` is set, passing any changes to `callback`.
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            changes = self.poll()
+            if changes:
+                callback(changes)
+            stop_event.wait(interval)
+
+    @staticmethod
+    def _key(result: Union[Flight, Trip]):
+        if isinstance(result, Trip):
+            return (
+                result.outbound.flightNumber,
+                result.outbound.departureTime,
+                result.inbound.flightNumber,
+                result.inbound.departureTime,
+            )
+        return result.flightNumber, result.departureTime
+
+    @staticmethod
+    def _price(result: Union[Flight, Trip]) -> float:
+        return result.totalPrice if isinstance(result, Trip) else result.price
@@ -1,11 +1,53 @@
 #!/usr/bin/env python
+import importlib.util
+import sys
+import types
 from setuptools import setup
+from setuptools.command.build_py import build_py
 from os import path
 
 this_directory = path.abspath(path.dirname(__file__))
 with open(path.join(this_directory, "README.md"), encoding="utf-8") as f:
     long_description = f.read()
 
+
+class BuildPyWithAirports(build_py):
+    """
+    Also compiles the airports CSV into the binary airports.bin shipped alongside it.
+    """
+
+    def run(self):
+        super().run()
+        csv_path = path.join(this_directory, "ryanair", "airports.csv")
+        if self.dry_run or not path.exists(csv_path):
+            return
+        binary_path = path.join(self.build_lib, "ryanair", "airports.bin")
+        self.announce(f"compiling {csv_path} to {binary_path}", level=2)
+        _load_airport_utils().compile_airports(csv_path, binary_path)
+
+
+def _load_airport_utils():
+    # Import airport_utils without running ryanair/__init__.py, whose dependencies may not be installed at build time
+    package = types.ModuleType("ryanair")
+    package.__path__ = [path.join(this_directory, "ryanair")]
+    saved = {name: sys.modules.get(name) for name in ("ryanair", "ryanair.types")}
+    sys.modules["ryanair"] = package
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "ryanair.airport_utils",
+            path.join(this_directory, "ryanair", "airport_utils.py"),
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
 setup(
     name="ryanair-py",
     version="3.0.0",
@@ -22,5 +64,11 @@ setup(
         "Operating System :: OS Independent",
     ],
     install_requires=["requests", "backoff"],
+    extras_require={
+        "async": ["httpx"],
+        "http2": ["httpx[http2]"],
+        "fast": ["orjson", "numpy"],
+    },
     package_data={"ryanair": ["airports.csv"]},
+    cmdclass={"build_py": BuildPyWithAirports},
 )
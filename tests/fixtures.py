@@ -0,0 +1,259 @@
+"""
+Fare API responses recorded from Ryanair, used by the tests and by the benchmarks' mock fare server.
+"""
+
+MOCKED_ONE_WAY_RESPONSE = {
+    "arrivalAirportCategories": None,
+    "fares": [
+        {
+            "outbound": {
+                "departureAirport": {
+                    "countryName": "Ireland",
+                    "iataCode": "DUB",
+                    "name": "Dublin",
+                    "seoName": "dublin",
+                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
+                },
+                "arrivalAirport": {
+                    "countryName": "United Kingdom",
+                    "iataCode": "BRS",
+                    "name": "Bristol",
+                    "seoName": "bristol",
+                    "city": {"name": "Bristol", "code": "BRISTOL", "countryCode": "gb"},
+                },
+                "departureDate": "2023-08-23T08:20:00",
+                "arrivalDate": "2023-08-23T09:30:00",
+                "price": {
+                    "value": 17.68,
+                    "valueMainUnit": "17",
+                    "valueFractionalUnit": "68",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "flightKey": "FR~ 504~ ~~DUB~08/23/2023 08:20~BRS~08/23/2023 09:30~~",
+                "flightNumber": "FR504",
+                "previousPrice": None,
+                "priceUpdated": 1692686097000,
+            },
+            "summary": {
+                "price": {
+                    "value": 17.68,
+                    "valueMainUnit": "17",
+                    "valueFractionalUnit": "68",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "previousPrice": None,
+                "newRoute": False,
+            },
+        },
+        {
+            "outbound": {
+                "departureAirport": {
+                    "countryName": "Ireland",
+                    "iataCode": "DUB",
+                    "name": "Dublin",
+                    "seoName": "dublin",
+                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
+                },
+                "arrivalAirport": {
+                    "countryName": "United Kingdom",
+                    "iataCode": "EDI",
+                    "name": "Edinburgh",
+                    "seoName": "edinburgh",
+                    "city": {
+                        "name": "Edinburgh",
+                        "code": "EDINBURGH",
+                        "countryCode": "gb",
+                    },
+                },
+                "departureDate": "2023-08-23T06:30:00",
+                "arrivalDate": "2023-08-23T07:40:00",
+                "price": {
+                    "value": 17.68,
+                    "valueMainUnit": "17",
+                    "valueFractionalUnit": "68",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "flightKey": "FR~ 812~ ~~DUB~08/23/2023 06:30~EDI~08/23/2023 07:40~~",
+                "flightNumber": "FR812",
+                "previousPrice": None,
+                "priceUpdated": 1692693061000,
+            },
+            "summary": {
+                "price": {
+                    "value": 17.68,
+                    "valueMainUnit": "17",
+                    "valueFractionalUnit": "68",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "previousPrice": None,
+                "newRoute": False,
+            },
+        },
+    ],
+    "nextPage": None,
+    "size": 2,
+}
+
+MOCKED_RETURN_RESPONSE = {
+    "arrivalAirportCategories": None,
+    "fares": [
+        {
+            "outbound": {
+                "departureAirport": {
+                    "countryName": "Ireland",
+                    "iataCode": "DUB",
+                    "name": "Dublin",
+                    "seoName": "dublin",
+                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
+                },
+                "arrivalAirport": {
+                    "countryName": "United Kingdom",
+                    "iataCode": "LBA",
+                    "name": "Leeds Bradford",
+                    "seoName": "leeds",
+                    "city": {"name": "Leeds", "code": "LEEDS", "countryCode": "gb"},
+                },
+                "departureDate": "2023-08-23T06:25:00",
+                "arrivalDate": "2023-08-23T07:30:00",
+                "price": {
+                    "value": 17.59,
+                    "valueMainUnit": "17",
+                    "valueFractionalUnit": "59",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "flightKey": "FR~ 152~ ~~DUB~08/23/2023 06:25~LBA~08/23/2023 07:30~~",
+                "flightNumber": "FR152",
+                "previousPrice": None,
+                "priceUpdated": 1692687660000,
+            },
+            "inbound": {
+                "departureAirport": {
+                    "countryName": "United Kingdom",
+                    "iataCode": "LBA",
+                    "name": "Leeds Bradford",
+                    "seoName": "leeds",
+                    "city": {"name": "Leeds", "code": "LEEDS", "countryCode": "gb"},
+                },
+                "arrivalAirport": {
+                    "countryName": "Ireland",
+                    "iataCode": "DUB",
+                    "name": "Dublin",
+                    "seoName": "dublin",
+                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
+                },
+                "departureDate": "2023-08-24T20:20:00",
+                "arrivalDate": "2023-08-24T21:20:00",
+                "price": {
+                    "value": 18.76,
+                    "valueMainUnit": "18",
+                    "valueFractionalUnit": "76",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "flightKey": "FR~ 456~ ~~LBA~08/24/2023 20:20~DUB~08/24/2023 21:20~~",
+                "flightNumber": "FR456",
+                "previousPrice": None,
+                "priceUpdated": 1692685719000,
+            },
+            "summary": {
+                "price": {
+                    "value": 36.35,
+                    "valueMainUnit": "36",
+                    "valueFractionalUnit": "35",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "previousPrice": None,
+                "newRoute": False,
+                "tripDurationDays": 1,
+            },
+        },
+        {
+            "outbound": {
+                "departureAirport": {
+                    "countryName": "Ireland",
+                    "iataCode": "DUB",
+                    "name": "Dublin",
+                    "seoName": "dublin",
+                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
+                },
+                "arrivalAirport": {
+                    "countryName": "United Kingdom",
+                    "iataCode": "LPL",
+                    "name": "Liverpool",
+                    "seoName": "liverpool",
+                    "city": {
+                        "name": "Liverpool",
+                        "code": "LIVERPOOL",
+                        "countryCode": "gb",
+                    },
+                },
+                "departureDate": "2023-08-23T15:20:00",
+                "arrivalDate": "2023-08-23T16:15:00",
+                "price": {
+                    "value": 20.6,
+                    "valueMainUnit": "20",
+                    "valueFractionalUnit": "60",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "flightKey": "FR~ 448~ ~~DUB~08/23/2023 15:20~LPL~08/23/2023 16:15~~",
+                "flightNumber": "FR448",
+                "previousPrice": None,
+                "priceUpdated": 1692693055000,
+            },
+            "inbound": {
+                "departureAirport": {
+                    "countryName": "United Kingdom",
+                    "iataCode": "LPL",
+                    "name": "Liverpool",
+                    "seoName": "liverpool",
+                    "city": {
+                        "name": "Liverpool",
+                        "code": "LIVERPOOL",
+                        "countryCode": "gb",
+                    },
+                },
+                "arrivalAirport": {
+                    "countryName": "Ireland",
+                    "iataCode": "DUB",
+                    "name": "Dublin",
+                    "seoName": "dublin",
+                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
+                },
+                "departureDate": "2023-08-24T21:20:00",
+                "arrivalDate": "2023-08-24T22:15:00",
+                "price": {
+                    "value": 18.51,
+                    "valueMainUnit": "18",
+                    "valueFractionalUnit": "51",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "flightKey": "FR~ 447~ ~~LPL~08/24/2023 21:20~DUB~08/24/2023 22:15~~",
+                "flightNumber": "FR447",
+                "previousPrice": None,
+                "priceUpdated": 1692686981000,
+            },
+            "summary": {
+                "price": {
+                    "value": 39.11,
+                    "valueMainUnit": "39",
+                    "valueFractionalUnit": "11",
+                    "currencyCode": "EUR",
+                    "currencySymbol": "€",
+                },
+                "previousPrice": None,
+                "newRoute": False,
+                "tripDurationDays": 1,
+            },
+        },
+    ],
+    "nextPage": None,
+    "size": 2,
+}
@@ -0,0 +1,227 @@
+import datetime
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ryanair import airport_utils
+from ryanair.airport_utils import Airport, AirportIndex, _haversine
+from ryanair.types import Flight
+
+AIRPORTS = {
+    "DUB": Airport(IATA_code="DUB", lat=53.421299, lng=-6.27007, location="IE-D,IE"),
+    "ORK": Airport(IATA_code="ORK", lat=51.841269, lng=-8.491111, location="IE-CO,IE"),
+    "BFS": Airport(IATA_code="BFS", lat=54.6575, lng=-6.215833, location="GB-NIR,GB"),
+    "STN": Airport(IATA_code="STN", lat=51.885, lng=0.235, location="GB-ENG,GB"),
+    "SUV": Airport(IATA_code="SUV", lat=-18.043301, lng=178.559006, location="FJ-C,FJ"),
+    "TVU": Airport(
+        IATA_code="TVU", lat=-16.690599, lng=-179.876999, location="FJ-N,FJ"
+    ),
+}
+
+
+class TestAirportIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.airports = [
+            Airport(
+                IATA_code=str(i),
+                lat=rng.uniform(-89.9, 89.9),
+                lng=rng.uniform(-180, 180),
+                location="",
+            )
+            for i in range(2000)
+        ] + list(AIRPORTS.values())
+        self.index = AirportIndex(self.airports)
+        self.points = [
+            (rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(50)
+        ]
+        self.points += [(53.4, -6.3), (-17, 179.9), (89.5, 10), (-89.9, -170)]
+
+    def _brute_force(self, lat, lng):
+        return sorted(
+            ((_haversine(lat, lng, a.lat, a.lng), a) for a in self.airports),
+            key=lambda result: result[0],
+        )
+
+    def test_within_matches_brute_force(self):
+        for lat, lng in self.points:
+            for radius_km in (50, 500, 3000):
+                expected = [a for d, a in self._brute_force(lat, lng) if d <= radius_km]
+                actual = [a for _, a in self.index.within(lat, lng, radius_km)]
+                self.assertEqual(actual, expected, (lat, lng, radius_km))
+
+    def test_nearest_matches_brute_force(self):
+        for lat, lng in self.points:
+            expected = [a for _, a in self._brute_force(lat, lng)[:5]]
+            actual = [a for _, a in self.index.nearest(lat, lng, k=5)]
+            self.assertEqual(actual, expected, (lat, lng))
+
+    def test_nearest_with_more_neighbours_than_airports(self):
+        index = AirportIndex(AIRPORTS.values())
+        self.assertEqual(len(index.nearest(0, 0, k=100)), len(AIRPORTS))
+
+    def test_search_crosses_antimeridian(self):
+        index = AirportIndex(AIRPORTS.values())
+        nearby = [a.IATA_code for _, a in index.within(-17, 179.9, 300)]
+        self.assertEqual(sorted(nearby), ["SUV", "TVU"])
+
+    @patch.object(airport_utils, "AIRPORT_INDEX", None)
+    @patch.object(airport_utils, "AIRPORTS", AIRPORTS)
+    def test_get_airports_near(self):
+        nearby = airport_utils.get_airports_near("DUB", 250)
+        self.assertEqual([a.IATA_code for _, a in nearby], ["BFS", "ORK"])
+        self.assertEqual(
+            airport_utils.get_nearest_airports(51.9, 0.2, k=1)[0][1].IATA_code,
+            "STN",
+        )
+
+
+AIRPORTS_CSV = """id,ident,type,name,latitude_deg,longitude_deg,iso_country,iso_region,iata_code
+1,EIDW,large_airport,Dublin Airport,53.421299,-6.27007,IE,IE-D,DUB
+2,EICK,large_airport,Cork Airport,51.841269,-8.491111,IE,IE-CO,ORK
+3,EGSS,large_airport,London Stansted Airport,51.885,0.235,GB,GB-ENG,STN
+4,XXXX,small_airport,No IATA code,10.0,10.0,FR,FR-IDF,
+5,LFPB,medium_airport,Paris-Le Bourget Airport,48.969398,2.44139,FR,FR-IDF,LBG
+"""
+
+
+class TestCompiledAirports(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "airports.csv")
+        self.binary_path = os.path.join(self.tmp_dir.name, "airports.bin")
+        with open(self.csv_path, "w", encoding="utf8") as f:
+            f.write(AIRPORTS_CSV)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_compiled_airports_match_csv(self):
+        airport_utils.compile_airports(self.csv_path, self.binary_path)
+        table = airport_utils.AirportTable(self.binary_path)
+        from_csv = airport_utils._load_airports_csv(self.csv_path)
+        del from_csv[""]
+
+        self.assertEqual(list(table), sorted(from_csv))
+        self.assertEqual(len(table), 4)
+        for iata_code, airport in from_csv.items():
+            self.assertEqual(table[iata_code], airport)
+        self.assertEqual(list(table.lats), [from_csv[c].lat for c in sorted(from_csv)])
+        self.assertNotIn("XXX", table)
+        self.assertNotIn("", table)
+        with self.assertRaises(KeyError):
+            _ = table["AAA"]
+
+    @patch.object(airport_utils, "AIRPORTS", None)
+    def test_load_airports_prefers_compiled_data(self):
+        airport_utils.compile_airports(self.csv_path, self.binary_path)
+
+        with patch.object(
+            airport_utils, "AIRPORTS_CSV_PATH", self.csv_path
+        ), patch.object(airport_utils, "AIRPORTS_BINARY_PATH", self.binary_path):
+            airports = airport_utils.load_airports()
+
+        self.assertIsInstance(airports, airport_utils.AirportTable)
+        self.assertEqual(airports["LBG"].location, "FR-IDF,FR")
+
+    @patch.object(airport_utils, "AIRPORTS", None)
+    def test_load_airports_ignores_compiled_data_from_another_csv(self):
+        airport_utils.compile_airports(self.csv_path, self.binary_path)
+        with open(self.csv_path, "w", encoding="utf8") as f:
+            f.write(AIRPORTS_CSV.replace("53.421299", "53.5"))
+        # Installers don't preserve modification times, so they mustn't be relied on
+        os.utime(self.csv_path, (0, 0))
+
+        with patch.object(
+            airport_utils, "AIRPORTS_CSV_PATH", self.csv_path
+        ), patch.object(airport_utils, "AIRPORTS_BINARY_PATH", self.binary_path):
+            airports = airport_utils.load_airports()
+
+        self.assertIsInstance(airports, dict)
+        self.assertEqual(airports["DUB"].lat, 53.5)
+
+    @patch.object(airport_utils, "AIRPORTS", None)
+    def test_load_airports_falls_back_to_csv(self):
+        with open(self.binary_path, "wb") as f:
+            f.write(b"not an airports file")
+
+        with patch.object(
+            airport_utils, "AIRPORTS_CSV_PATH", self.csv_path
+        ), patch.object(
+            airport_utils, "AIRPORTS_BINARY_PATH", self.binary_path
+        ), patch.object(
+            airport_utils.logger, "exception"
+        ) as mock_log:
+            airports = airport_utils.load_airports()
+
+        self.assertIsInstance(airports, dict)
+        self.assertEqual(airports["DUB"].lat, 53.421299)
+        mock_log.assert_called_once()
+
+
+@patch.object(airport_utils, "AIRPORTS", AIRPORTS)
+@patch.dict(airport_utils._DISTANCES, clear=True)
+class TestDistances(unittest.TestCase):
+    def _flight(self, origin, destination):
+        return Flight(
+            departureTime=datetime.datetime(2023, 8, 23, 8, 20),
+            flightNumber="FR 1",
+            price=10,
+            currency="EUR",
+            origin=origin,
+            originFull="",
+            destination=destination,
+            destinationFull="",
+        )
+
+    def test_flight_distances_match_single_distances(self):
+        flights = [
+            self._flight("DUB", "STN"),
+            self._flight("STN", "DUB"),
+            self._flight("ORK", "SUV"),
+            self._flight("DUB", "STN"),
+        ]
+        expected = [
+            _haversine(
+                AIRPORTS[f.origin].lat,
+                AIRPORTS[f.origin].lng,
+                AIRPORTS[f.destination].lat,
+                AIRPORTS[f.destination].lng,
+            )
+            for f in flights
+        ]
+
+        for distance, expected_distance in zip(
+            airport_utils.get_flight_distances(flights), expected
+        ):
+            self.assertAlmostEqual(distance, expected_distance, places=6)
+        self.assertAlmostEqual(
+            airport_utils.get_flight_distance(flights[2]), expected[2], places=6
+        )
+
+    def test_pure_python_fallback(self):
+        with patch.object(airport_utils, "np", None):
+            without_numpy = airport_utils.get_distances_between_airports(
+                ["DUB", "TVU"], ["ORK", "SUV"]
+            )
+        airport_utils._DISTANCES.clear()
+        with_numpy = airport_utils.get_distances_between_airports(
+            ["DUB", "TVU"], ["ORK", "SUV"]
+        )
+
+        for a, b in zip(without_numpy, with_numpy):
+            self.assertAlmostEqual(a, b, places=6)
+
+    def test_routes_are_memoised(self):
+        airport_utils.get_distances_between_airports(["DUB"], ["STN"])
+
+        with patch.object(airport_utils, "_haversine_many") as mock_haversine_many:
+            airport_utils.get_distances_between_airports(["DUB", "STN"], ["STN", "DUB"])
+            airport_utils.get_distance_between_airports("STN", "DUB")
+            mock_haversine_many.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import unittest
+from unittest.mock import patch, Mock, AsyncMock, call
+
+import httpx
+
+from ryanair import AsyncRyanair, Ryanair
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+
+class TestAsyncRyanair(unittest.IsolatedAsyncioTestCase):
+    def _mock_client(self, mock_get_session, response):
+        mock_response = Mock()
+        mock_response.json.return_value = response
+        client = Mock()
+        client.get = AsyncMock(return_value=mock_response)
+        mock_get_session.return_value = client
+        return client
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_get_cheapest_flights_matches_sync_parsing(self, mock_get_session):
+        self._mock_client(mock_get_session, MOCKED_ONE_WAY_RESPONSE)
+
+        async with AsyncRyanair() as ryanair_instance:
+            flights = await ryanair_instance.get_cheapest_flights(
+                "DUB", "2023-08-23", "2023-08-23"
+            )
+
+        with patch("ryanair.SessionManager.SessionManager.get_session") as sync_get:
+            sync_get.return_value.get.return_value.json.return_value = (
+                MOCKED_ONE_WAY_RESPONSE
+            )
+            sync_flights = Ryanair().get_cheapest_flights(
+                "DUB", "2023-08-23", "2023-08-23"
+            )
+
+        self.assertEqual(flights, sync_flights)
+        self.assertEqual(ryanair_instance.num_queries, 1)
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_get_cheapest_return_flights(self, mock_get_session):
+        client = self._mock_client(mock_get_session, MOCKED_RETURN_RESPONSE)
+
+        async with AsyncRyanair("EUR") as ryanair_instance:
+            trips = await ryanair_instance.get_cheapest_return_flights(
+                "DUB", "2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24"
+            )
+
+        self.assertEqual(len(trips), 2)
+        self.assertEqual(trips[0].totalPrice, 36.35)
+        self.assertEqual(client.get.call_args.kwargs["params"]["currency"], "EUR")
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_retryable_query_retries_on_failure_5_times(self, mock_get_session):
+        client = Mock()
+        client.get = AsyncMock(side_effect=httpx.ConnectError("boom"))
+        mock_get_session.return_value = client
+
+        async with AsyncRyanair() as ryanair_instance:
+            with self.assertRaises(httpx.ConnectError):
+                await ryanair_instance._retryable_query("mock_url")
+
+        client.get.assert_has_calls([call("mock_url", params=None)] * 5)
+        self.assertEqual(ryanair_instance.num_queries, 5)
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_concurrency_is_bounded(self, mock_get_session):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_get(url, params=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = Mock()
+            response.json.return_value = {"fares": []}
+            return response
+
+        client = Mock()
+        client.get = slow_get
+        mock_get_session.return_value = client
+
+        async with AsyncRyanair(max_concurrency=3) as ryanair_instance:
+            await asyncio.gather(
+                *(
+                    ryanair_instance.get_cheapest_flights(
+                        "DUB", f"2023-08-{day}", f"2023-08-{day}"
+                    )
+                    for day in range(10, 20)
+                )
+            )
+
+        self.assertEqual(max_in_flight, 3)
+        self.assertEqual(ryanair_instance.num_queries, 10)
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_iter_cheapest_flights(self, mock_get_session):
+        client = self._mock_client(mock_get_session, MOCKED_ONE_WAY_RESPONSE)
+
+        async with AsyncRyanair() as ryanair_instance:
+            flights = [
+                flight
+                async for flight in ryanair_instance.iter_cheapest_flights(
+                    ["DUB", "STN", "BGY"],
+                    [("2023-08-23", "2023-08-23")],
+                    max_concurrency=2,
+                )
+            ]
+
+        self.assertEqual(len(flights), 6)
+        self.assertEqual(client.get.await_count, 3)
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_iter_cheapest_return_flights_raises_on_error(self, mock_get_session):
+        client = Mock()
+        client.get = AsyncMock(side_effect=httpx.ConnectError("boom"))
+        mock_get_session.return_value = client
+
+        async with AsyncRyanair() as ryanair_instance:
+            with self.assertRaises(httpx.ConnectError):
+                async for _ in ryanair_instance.iter_cheapest_return_flights(
+                    ["DUB"], [("2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24")]
+                ):
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
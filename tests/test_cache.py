@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from ryanair import Ryanair
+from ryanair.cache import Cache, MemoryCache, SQLiteCache, make_cache_key
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_key_is_independent_of_param_order(self):
+        self.assertEqual(
+            make_cache_key("url", {"a": 1, "b": "x"}),
+            make_cache_key("url", {"b": "x", "a": 1}),
+        )
+        self.assertNotEqual(
+            make_cache_key("url", {"a": 1}), make_cache_key("url", {"a": 2})
+        )
+
+    @patch("ryanair.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = MemoryCache(ttl=60)
+        cache.set("url", {"a": 1}, {"fares": []})
+        cache.set("url", {"a": 2}, {"fares": []}, ttl=600)
+
+        mock_monotonic.return_value = 159
+        self.assertEqual(cache.get("url", {"a": 1}), {"fares": []})
+
+        mock_monotonic.return_value = 160
+        self.assertIsNone(cache.get("url", {"a": 1}))
+        self.assertEqual(cache.get("url", {"a": 2}), {"fares": []})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", None, 1)
+        cache.set("b", None, 2)
+        cache.get("a")
+        cache.set("c", None, 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_invalidate(self):
+        cache = MemoryCache()
+        cache.set("a", {"x": 1}, 1)
+        cache.set("b", None, 2)
+
+        cache.invalidate("a", {"x": 1})
+        self.assertIsNone(cache.get("a", {"x": 1}))
+        self.assertEqual(cache.get("b"), 2)
+
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_incomplete_caches_cannot_be_created(self):
+        class GetOnlyCache(Cache):
+            def get(self, url, params=None):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyCache()
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_entries_persist_across_instances(self):
+        cache = SQLiteCache(self.path)
+        cache.set("url", {"a": 1}, MOCKED_ONE_WAY_RESPONSE)
+        cache.close()
+
+        restarted = SQLiteCache(self.path)
+        self.assertEqual(restarted.get("url", {"a": 1}), MOCKED_ONE_WAY_RESPONSE)
+        fetched_at, _ = restarted.get_entry("url", {"a": 1})
+        self.assertIsInstance(fetched_at, float)
+        restarted.close()
+
+    @patch("ryanair.cache.time.time")
+    def test_entries_expire_after_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        cache = SQLiteCache(self.path, ttl=60)
+        cache.set("url", None, {"fares": []})
+
+        mock_time.return_value = 1059
+        self.assertEqual(cache.get("url"), {"fares": []})
+        mock_time.return_value = 1060
+        self.assertIsNone(cache.get("url"))
+        cache.close()
+
+    @patch("ryanair.cache.time.time")
+    def test_oldest_entries_are_evicted(self, mock_time):
+        mock_time.return_value = 1000
+        cache = SQLiteCache(self.path, max_entries=2)
+        for i in range(3):
+            mock_time.return_value = 1000 + i
+            cache.set(f"url{i}", None, i)
+        cache.evict()
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("url0"))
+        self.assertEqual(cache.get("url2"), 2)
+
+        cache.invalidate("url2")
+        self.assertIsNone(cache.get("url2"))
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_short_lived_writers_evict(self):
+        for n in range(20):
+            cache = SQLiteCache(self.path, ttl=0, max_entries=5)
+            for i in range(50):
+                cache.set(f"url{n}-{i}", None, i)
+            cache.close()
+
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertLess(rows, SQLiteCache.EVICTION_INTERVAL)
+
+        SQLiteCache(self.path).close()
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(rows, 0)
+
+    def test_concurrent_writers(self):
+        cache = SQLiteCache(self.path)
+
+        def write(n):
+            for i in range(20):
+                cache.set(f"url{n}", {"i": i}, i)
+            cache.close()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(cache), 8 * 20)
+        cache.close()
+
+
+class TestRyanairCache(unittest.TestCase):
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_repeated_queries_are_served_from_cache(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair(cache=MemoryCache())
+        first = ryanair_instance.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+        second = ryanair_instance.get_cheapest_flights(
+            "DUB", "2023-08-23", "2023-08-23"
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(ryanair_instance.num_queries, 1)
+        self.assertEqual(ryanair_instance.cache_hits, 1)
+        self.assertEqual(ryanair_instance.cache_misses, 1)
+
+        ryanair_instance.invalidate_cache()
+        ryanair_instance.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+        self.assertEqual(ryanair_instance.num_queries, 2)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_no_cache_by_default(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = {"fares": []}
+
+        ryanair_instance = Ryanair()
+        ryanair_instance.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+        ryanair_instance.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+
+        self.assertEqual(ryanair_instance.num_queries, 2)
+        self.assertEqual(ryanair_instance.cache_misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock
+
+from ryanair import AsyncRyanair, Ryanair
+from ryanair.coalesce import SingleFlight, AsyncSingleFlight
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_call(self):
+        single_flight = SingleFlight()
+        calls = 0
+        started = threading.Event()
+        release = threading.Event()
+
+        def fn():
+            nonlocal calls
+            calls += 1
+            started.set()
+            release.wait()
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(single_flight.do, "key", fn)
+            started.wait()
+            followers = [executor.submit(single_flight.do, "key", fn) for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(leader.result(), ("result", False))
+        for follower in followers:
+            self.assertEqual(follower.result(), ("result", True))
+
+    def test_exceptions_are_shared_and_not_remembered(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait()
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, "key", fail)
+            started.wait()
+            follower = executor.submit(single_flight.do, "key", fail)
+            time.sleep(0.05)
+            release.set()
+
+        self.assertRaises(ValueError, leader.result)
+        self.assertRaises(ValueError, follower.result)
+        self.assertEqual(single_flight.do("key", lambda: 1), (1, False))
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_ryanair_coalesces_identical_queries(self, mock_get_session):
+        def slow_get(url, params=None):
+            time.sleep(0.1)
+            response = Mock()
+            response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+            return response
+
+        mock_get_session.return_value.get.side_effect = slow_get
+        ryanair = Ryanair()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda _: ryanair.get_cheapest_flights(
+                        "DUB", "2023-08-23", "2023-08-23"
+                    ),
+                    range(4),
+                )
+            )
+
+        self.assertEqual(ryanair.num_queries, 1)
+        self.assertEqual(ryanair.coalesced_queries, 3)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len(results[0]), 2)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_ryanair_coalescing_can_be_disabled(self, mock_get_session):
+        def slow_get(url, params=None):
+            time.sleep(0.05)
+            response = Mock()
+            response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+            return response
+
+        mock_get_session.return_value.get.side_effect = slow_get
+        ryanair = Ryanair(coalesce_queries=False)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(
+                executor.map(
+                    lambda _: ryanair.get_cheapest_flights(
+                        "DUB", "2023-08-23", "2023-08-23"
+                    ),
+                    range(3),
+                )
+            )
+
+        self.assertEqual(ryanair.num_queries, 3)
+        self.assertEqual(ryanair.coalesced_queries, 0)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_tasks_share_one_call(self):
+        single_flight = AsyncSingleFlight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(single_flight.do("key", fn) for _ in range(5)))
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(results[0], ("result", False))
+        self.assertEqual(results[1:], [("result", True)] * 4)
+
+    async def test_cancelled_waiter_does_not_cancel_the_call(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        leader = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        self.assertEqual(await leader, ("result", False))
+        with self.assertRaises(asyncio.CancelledError):
+            await follower
+
+    async def test_cancelled_leader_does_not_cancel_the_call(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        leader = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        self.assertEqual(await follower, ("result", True))
+        self.assertFalse(follower.cancelled())
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+    async def test_call_is_cancelled_once_every_caller_is(self):
+        single_flight = AsyncSingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fn():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(single_flight.do("key", fn)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        async def fn_again():
+            return "result"
+
+        self.assertEqual(await single_flight.do("key", fn_again), ("result", False))
+
+    async def test_new_caller_does_not_share_a_call_being_cancelled(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        first = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        second = asyncio.create_task(single_flight.do("key", fn))
+
+        self.assertEqual(await second, ("result", False))
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_async_ryanair_coalesces_identical_queries(self, mock_get_session):
+        async def slow_get(url, params=None):
+            await asyncio.sleep(0.01)
+            response = Mock()
+            response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+            return response
+
+        client = Mock()
+        client.get = slow_get
+        mock_get_session.return_value = client
+
+        async with AsyncRyanair() as ryanair:
+            results = await asyncio.gather(
+                *(
+                    ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+                    for _ in range(5)
+                )
+            )
+
+        self.assertEqual(ryanair.num_queries, 1)
+        self.assertEqual(ryanair.coalesced_queries, 4)
+        self.assertTrue(all(result == results[0] for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from ryanair import AsyncRyanair, Ryanair
+from ryanair.concurrency import AIMDController
+from ryanair.retry import RetryPolicy
+
+
+class TestAIMDController(unittest.TestCase):
+    def test_limit_increases_additively(self):
+        controller = AIMDController(initial_limit=2, max_limit=4)
+
+        # Roughly one more for every `limit` healthy responses
+        for _ in range(3):
+            controller.record(0.1, 200)
+        self.assertEqual(controller.limit, 3)
+
+        for _ in range(20):
+            controller.record(0.1, 200)
+        self.assertEqual(controller.limit, 4)
+
+    @patch("ryanair.concurrency.logger")
+    def test_limit_is_cut_multiplicatively(self, mock_logger):
+        controller = AIMDController(initial_limit=16)
+
+        controller.record(0.1, 429)
+        self.assertEqual(controller.limit, 8)
+        mock_logger.info.assert_called_once()
+
+        # Requests which were in flight before the cut are part of the same episode
+        controller.record(0.1, 503)
+        self.assertEqual(controller.limit, 8)
+
+        time.sleep(0.02)
+        controller.record(0.01, None)
+        self.assertEqual(controller.limit, 4)
+
+    def test_latency_spikes_cut_the_limit(self):
+        controller = AIMDController(initial_limit=8, latency_spike_factor=3)
+        controller.record(0.01, 200)
+
+        controller.record(0.02, 200)
+        self.assertEqual(controller.limit, 8)
+        controller.record(0.1, 200)
+        self.assertEqual(controller.limit, 4)
+
+    def test_limit_is_bounded(self):
+        controller = AIMDController(initial_limit=1, min_limit=1)
+        controller.record(0.1, 500)
+        self.assertEqual(controller.limit, 1)
+
+
+class TestControlledClient(unittest.TestCase):
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_in_flight_queries_are_limited(self, mock_get_session):
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def slow_get(url, params=None):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {"fares": []}
+            return response
+
+        mock_get_session.return_value.get.side_effect = slow_get
+        controller = AIMDController(initial_limit=2, max_limit=2)
+
+        ryanair = Ryanair(max_workers=8, concurrency_controller=controller)
+        batch = ryanair.get_cheapest_flights_many(
+            [f"A{i:02d}" for i in range(16)], "2023-09-01", "2023-09-01"
+        )
+
+        self.assertEqual(len(batch.results), 16)
+        self.assertEqual(max_in_flight, 2)
+        self.assertEqual(ryanair.concurrency_limit, 2)
+
+    @patch("ryanair.ryanair.logger")
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_throttling_cuts_the_limit(self, mock_get_session, _):
+        response = Mock()
+        response.status_code = 429
+        response.headers = {}
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        mock_get_session.return_value.get.return_value = response
+        controller = AIMDController(initial_limit=8)
+
+        ryanair = Ryanair(
+            concurrency_controller=controller, retry_policy=RetryPolicy(max_tries=1)
+        )
+        with self.assertRaises(requests.HTTPError):
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-01")
+
+        self.assertEqual(ryanair.concurrency_limit, 4)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_no_limit_without_a_controller(self, mock_get_session):
+        self.assertIsNone(Ryanair().concurrency_limit)
+
+
+class TestAsyncControlledClient(unittest.IsolatedAsyncioTestCase):
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_in_flight_queries_are_limited(self, mock_get_session):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_get(url, params=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {"fares": []}
+            return response
+
+        client = Mock()
+        client.get = slow_get
+        mock_get_session.return_value = client
+        controller = AIMDController(initial_limit=3, max_limit=3)
+
+        async with AsyncRyanair(concurrency_controller=controller) as ryanair:
+            await asyncio.gather(
+                *(
+                    ryanair.get_cheapest_flights(
+                        f"A{i:02d}", "2023-09-01", "2023-09-01"
+                    )
+                    for i in range(12)
+                )
+            )
+
+        self.assertEqual(max_in_flight, 3)
+        self.assertEqual(ryanair.num_queries, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import datetime
+import unittest
+from unittest.mock import patch
+
+from ryanair import Ryanair, airport_utils
+from ryanair.airport_utils import Airport
+from ryanair.itineraries import ItinerarySearch
+from ryanair.types import Flight
+
+AIRPORTS = {
+    "DUB": Airport(IATA_code="DUB", lat=53.42, lng=-6.27, location="IE-D,IE"),
+    "STN": Airport(IATA_code="STN", lat=51.88, lng=0.23, location="GB-ENG,GB"),
+    "BGY": Airport(IATA_code="BGY", lat=45.67, lng=9.70, location="IT-25,IT"),
+    "ATH": Airport(IATA_code="ATH", lat=37.94, lng=23.94, location="GR-I,GR"),
+    "KEF": Airport(IATA_code="KEF", lat=63.99, lng=-22.60, location="IS-2,IS"),
+}
+
+
+def flight(origin, destination, departure, arrival, price):
+    return Flight(
+        departureTime=datetime.datetime.fromisoformat(departure),
+        flightNumber=f"FR {origin}{destination}",
+        price=price,
+        currency="EUR",
+        origin=origin,
+        originFull=origin,
+        destination=destination,
+        destinationFull=destination,
+        arrivalTime=datetime.datetime.fromisoformat(arrival),
+    )
+
+
+FARES = {
+    "DUB": [
+        flight("DUB", "STN", "2023-09-01T08:00", "2023-09-01T09:15", 15),
+        flight("DUB", "BGY", "2023-09-01T06:00", "2023-09-01T09:30", 30),
+        flight("DUB", "KEF", "2023-09-01T06:00", "2023-09-01T08:30", 5),
+        flight("DUB", "ATH", "2023-09-01T07:00", "2023-09-01T13:00", 120),
+        flight("DUB", "STN", "2023-09-02T08:00", "2023-09-02T09:15", 16),
+    ],
+    "STN": [
+        # Too tight a connection from the DUB flight
+        flight("STN", "ATH", "2023-09-01T10:00", "2023-09-01T15:30", 10),
+        flight("STN", "ATH", "2023-09-02T07:00", "2023-09-02T12:30", 40),
+        flight("STN", "ATH", "2023-09-02T12:00", "2023-09-02T17:30", 10),
+    ],
+    "BGY": [flight("BGY", "ATH", "2023-09-01T15:00", "2023-09-01T18:00", 25)],
+    "KEF": [flight("KEF", "ATH", "2023-09-01T15:00", "2023-09-01T23:00", 1)],
+}
+
+
+@patch.object(airport_utils, "AIRPORTS", AIRPORTS)
+@patch.dict(airport_utils._DISTANCES, clear=True)
+@patch("ryanair.SessionManager.SessionManager.get_session")
+class TestItinerarySearch(unittest.TestCase):
+    def _search(self, **kwargs):
+        ryanair_instance = Ryanair()
+        calls = []
+
+        def get_cheapest_flights(
+            airport,
+            date_from,
+            date_to,
+            departure_time_from="00:00",
+            departure_time_to="23:59",
+            destination_airport=None,
+        ):
+            calls.append((airport, date_from, departure_time_from))
+            # Like the API, only the cheapest fare to each destination is returned
+            cheapest = {}
+            for f in FARES.get(airport, []):
+                if (
+                    (
+                        destination_airport is None
+                        or f.destination == destination_airport
+                    )
+                    and str(date_from)
+                    <= f.departureTime.date().isoformat()
+                    <= str(date_to)
+                    and departure_time_from <= f.departureTime.strftime("%H:%M")
+                    and f.departureTime.strftime("%H:%M") <= departure_time_to
+                    and (
+                        f.destination not in cheapest
+                        or f.price < cheapest[f.destination].price
+                    )
+                ):
+                    cheapest[f.destination] = f
+            return list(cheapest.values())
+
+        ryanair_instance.get_cheapest_flights = get_cheapest_flights
+        return ItinerarySearch(ryanair_instance, **kwargs), calls
+
+    def test_cheapest_itineraries(self, _):
+        search, calls = self._search()
+        itineraries = search.search("DUB", "ATH", "2023-09-01", "2023-09-01", k=3)
+
+        self.assertEqual(
+            [
+                (itinerary.totalPrice, [leg.origin for leg in itinerary.legs])
+                for itinerary in itineraries
+            ],
+            [(55, ["DUB", "BGY"]), (55, ["DUB", "STN"]), (120, ["DUB"])],
+        )
+        # KEF is too far out of the way to be worth querying
+        self.assertNotIn("KEF", [call[0] for call in calls])
+        self.assertIn(("STN", "2023-09-01", "11:15"), calls)
+        self.assertEqual(search.num_queries, len(calls))
+
+    def test_without_detour_pruning(self, _):
+        search, _ = self._search(max_detour=None)
+        itineraries = search.search("DUB", "ATH", "2023-09-01", "2023-09-01", k=1)
+
+        self.assertEqual(itineraries[0].totalPrice, 6)
+        self.assertEqual(
+            [leg.destination for leg in itineraries[0].legs], ["KEF", "ATH"]
+        )
+
+    def test_query_budget(self, _):
+        search, calls = self._search(max_queries=2)
+        search.search("DUB", "ATH", "2023-09-01", "2023-09-01")
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(search.num_queries, 2)
+
+    def test_connects_from_every_departure_day(self, _):
+        search, calls = self._search()
+        itineraries = search.search("DUB", "ATH", "2023-09-01", "2023-09-02", k=1)
+
+        self.assertEqual(itineraries[0].totalPrice, 26)
+        self.assertEqual(
+            [leg.departureTime.date() for leg in itineraries[0].legs],
+            [datetime.date(2023, 9, 2)] * 2,
+        )
+        self.assertIn(("DUB", "2023-09-01", "00:00"), calls)
+        self.assertIn(("DUB", "2023-09-02", "00:00"), calls)
+        self.assertEqual(search.num_queries, len(calls))
+
+    def test_first_queries_are_within_budget(self, _):
+        search, calls = self._search(max_queries=0)
+
+        self.assertEqual(search.search("DUB", "ATH", "2023-09-01", "2023-09-02"), [])
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
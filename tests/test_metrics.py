@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch, Mock, AsyncMock
+
+import requests
+
+from ryanair import AsyncRyanair, Ryanair
+from ryanair.metrics import Histogram, MetricsRecorder, Metrics, get_endpoint
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observations_are_bucketed_cumulatively(self):
+        histogram = Histogram(buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 3.65)
+        self.assertEqual(
+            histogram.cumulative_counts(), [(0.1, 2), (1, 3), (float("inf"), 4)]
+        )
+
+    def test_get_endpoint(self):
+        self.assertEqual(
+            get_endpoint("https://services-api.ryanair.com/farfnd/v4/oneWayFares"),
+            "oneWayFares",
+        )
+
+
+class TestMetrics(unittest.TestCase):
+    @staticmethod
+    def _mock_response(response_json, content=b"{}"):
+        response = Mock()
+        response.json.return_value = response_json
+        response.content = content
+        response.status_code = 200
+        return response
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_requests_and_parsing_are_recorded(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = [
+            self._mock_response(MOCKED_ONE_WAY_RESPONSE, b"x" * 100),
+            self._mock_response(MOCKED_RETURN_RESPONSE, b"x" * 50),
+        ]
+        metrics = MetricsRecorder()
+        ryanair = Ryanair(metrics=metrics)
+
+        with patch(
+            "ryanair.ryanair._BaseRyanair._parse_json", side_effect=lambda r: r.json()
+        ):
+            ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+            ryanair.get_cheapest_return_flights(
+                "DUB", "2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24"
+            )
+
+        self.assertEqual(metrics.requests, {"oneWayFares": 1, "roundTripFares": 1})
+        self.assertEqual(
+            metrics.bytes_received, {"oneWayFares": 100, "roundTripFares": 50}
+        )
+        self.assertEqual(metrics.statuses[("oneWayFares", 200)], 1)
+        self.assertEqual(metrics.latency["oneWayFares"].count, 1)
+        self.assertEqual(metrics.parse_time["oneWayFares"].count, 1)
+        self.assertEqual(metrics.parse_time["roundTripFares"].count, 1)
+
+    @patch("ryanair.ryanair.logger")
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_retries_and_give_ups_are_recorded(self, mock_get_session, _):
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError("boom")
+        metrics = Mock(spec=Metrics)
+        ryanair = Ryanair(metrics=metrics)
+
+        with self.assertRaises(requests.ConnectionError):
+            ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+
+        self.assertEqual(metrics.on_retry.call_count, 4)
+        self.assertEqual(
+            [c.args[1] for c in metrics.on_retry.call_args_list], [1, 2, 3, 4]
+        )
+        endpoint, tries, exception = metrics.on_give_up.call_args.args
+        self.assertEqual((endpoint, tries, str(exception)), ("oneWayFares", 5, "boom"))
+        metrics.on_request.assert_not_called()
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_nothing_is_measured_without_metrics(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+        ryanair = Ryanair()
+
+        with patch("ryanair.ryanair.perf_counter") as perf_counter:
+            ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+
+        perf_counter.assert_not_called()
+
+
+class TestAsyncMetrics(unittest.IsolatedAsyncioTestCase):
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_requests_and_parsing_are_recorded(self, mock_get_session):
+        response = Mock()
+        response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+        response.content = "not bytes"
+        response.status_code = 200
+        client = Mock()
+        client.get = AsyncMock(return_value=response)
+        mock_get_session.return_value = client
+        metrics = MetricsRecorder()
+
+        async with AsyncRyanair(metrics=metrics) as ryanair:
+            await ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+
+        self.assertEqual(metrics.requests, {"oneWayFares": 1})
+        self.assertEqual(metrics.bytes_received, {"oneWayFares": 0})
+        self.assertEqual(metrics.latency["oneWayFares"].count, 1)
+        self.assertEqual(metrics.parse_time["oneWayFares"].count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, Mock, AsyncMock
+
+from ryanair import AsyncRyanair, Ryanair
+from ryanair.metrics import MetricsRecorder
+from ryanair.ratelimit import RateLimiter, TokenBucket, SQLiteTokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_bursts_then_paces(self):
+        bucket = TokenBucket(rate=10, burst=3)
+
+        with patch("ryanair.ratelimit.time.monotonic", return_value=100.0):
+            bucket._updated_at = 100.0
+            waits = [bucket.reserve() for _ in range(5)]
+
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertAlmostEqual(waits[3], 0.1)
+        self.assertAlmostEqual(waits[4], 0.2)
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        with patch("ryanair.ratelimit.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            bucket._updated_at = 100.0
+            for _ in range(3):
+                bucket.reserve()
+
+            # One token is owed, so after a second the bucket has refilled to its burst size
+            monotonic.return_value = 101.0
+            self.assertEqual([bucket.reserve() for _ in range(2)], [0, 0])
+            self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_shared_by_threads(self):
+        bucket = TokenBucket(rate=1, burst=10)
+        waits = []
+        lock = threading.Lock()
+
+        def reserve():
+            for _ in range(5):
+                wait = bucket.reserve()
+                with lock:
+                    waits.append(wait)
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(1 for wait in waits if wait == 0), 10)
+        self.assertAlmostEqual(max(waits), 10, delta=0.1)
+
+    def test_limiters_must_implement_reserve(self):
+        class NoReserve(RateLimiter):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoReserve()
+
+
+class TestSQLiteTokenBucket(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_budget_is_shared_between_buckets(self):
+        # As if in two processes
+        first = SQLiteTokenBucket(self.path, rate=1, burst=2)
+        second = SQLiteTokenBucket(self.path, rate=1, burst=2)
+
+        self.assertEqual(first.reserve(), 0)
+        self.assertEqual(second.reserve(), 0)
+        self.assertGreater(first.reserve(), 0.9)
+
+        other = SQLiteTokenBucket(self.path, rate=1, burst=2, name="other")
+        self.assertEqual(other.reserve(), 0)
+
+        for bucket in (first, second, other):
+            bucket.close()
+
+
+class TestRateLimitedClient(unittest.TestCase):
+    @patch("ryanair.ryanair.sleep")
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_queries_wait_for_the_rate_limiter(self, mock_get_session, mock_sleep):
+        mock_get_session.return_value.get.return_value.json.return_value = {"fares": []}
+        limiter = Mock()
+        limiter.reserve.side_effect = [0, 0.5, 0.25]
+        metrics = MetricsRecorder()
+
+        ryanair = Ryanair(rate_limiter=limiter, metrics=metrics)
+        for day in ("2023-09-01", "2023-09-02", "2023-09-03"):
+            ryanair.get_cheapest_flights("DUB", day, day)
+
+        self.assertEqual(ryanair.rate_limit_wait, 0.75)
+        self.assertEqual([c.args for c in mock_sleep.call_args_list], [(0.5,), (0.25,)])
+        self.assertEqual(metrics.rate_limit_wait["oneWayFares"].count, 3)
+
+
+class TestAsyncRateLimitedClient(unittest.IsolatedAsyncioTestCase):
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_queries_wait_for_the_rate_limiter(self, mock_get_session):
+        response = Mock()
+        response.json.return_value = {"fares": []}
+        client = Mock()
+        client.get = AsyncMock(return_value=response)
+        mock_get_session.return_value = client
+
+        async with AsyncRyanair(rate_limiter=TokenBucket(rate=100, burst=1)) as ryanair:
+            for day in ("2023-09-01", "2023-09-02", "2023-09-03"):
+                await ryanair.get_cheapest_flights("DUB", day, day)
+
+        self.assertGreater(ryanair.rate_limit_wait, 0)
+        self.assertLessEqual(ryanair.rate_limit_wait, 0.02)
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_blocking_limiters_are_kept_off_the_event_loop(
+        self, mock_get_session
+    ):
+        response = Mock()
+        response.json.return_value = {"fares": []}
+        client = Mock()
+        client.get = AsyncMock(return_value=response)
+        mock_get_session.return_value = client
+
+        with tempfile.TemporaryDirectory() as tmp:
+            limiter = SQLiteTokenBucket(
+                os.path.join(tmp, "ratelimit.sqlite"), rate=100, burst=1
+            )
+            reserving_threads = []
+            reserve = limiter.reserve
+
+            def record_thread():
+                reserving_threads.append(threading.get_ident())
+                return reserve()
+
+            limiter.reserve = record_thread
+            async with AsyncRyanair(rate_limiter=limiter) as ryanair:
+                await ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-01")
+            limiter.close()
+
+        self.assertEqual(len(reserving_threads), 1)
+        self.assertNotEqual(reserving_threads[0], threading.get_ident())
+        self.assertEqual(ryanair.num_queries, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch, Mock, AsyncMock
+
+import backoff
+import httpx
+import requests
+
+from ryanair import AsyncRyanair, Ryanair
+from ryanair.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def _error_response(status, headers=None):
+    response = Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.raise_for_status.side_effect = requests.HTTPError(
+        f"{status} Error", response=response
+    )
+    return response
+
+
+def _ok_response():
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"fares": []}
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_transient_errors_are_retryable(self):
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.is_retryable(requests.ConnectionError()))
+        self.assertTrue(policy.is_retryable(requests.Timeout()))
+        self.assertTrue(policy.is_retryable(httpx.ConnectError("boom")))
+        for status in (429, 500, 503):
+            self.assertTrue(
+                policy.is_retryable(
+                    _error_response(status).raise_for_status.side_effect
+                )
+            )
+        for status in (400, 401, 404):
+            self.assertFalse(
+                policy.is_retryable(
+                    _error_response(status).raise_for_status.side_effect
+                )
+            )
+        self.assertFalse(policy.is_retryable(ValueError()))
+        self.assertFalse(policy.is_retryable(requests.exceptions.MissingSchema()))
+        self.assertFalse(policy.is_retryable(requests.TooManyRedirects()))
+        self.assertFalse(policy.is_retryable(requests.JSONDecodeError("x", "", 0)))
+        self.assertFalse(policy.is_retryable(httpx.UnsupportedProtocol("boom")))
+
+    def test_retry_after(self):
+        policy = RetryPolicy()
+        in_seconds = _error_response(429, {"Retry-After": "3"})
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        as_date = _error_response(503, {"Retry-After": format_datetime(retry_at)})
+
+        self.assertEqual(
+            policy.get_retry_after(in_seconds.raise_for_status.side_effect), 3
+        )
+        self.assertAlmostEqual(
+            policy.get_retry_after(as_date.raise_for_status.side_effect), 30, delta=2
+        )
+        self.assertIsNone(
+            policy.get_retry_after(_error_response(503).raise_for_status.side_effect)
+        )
+
+    def test_wait_gen_prefers_retry_after(self):
+        policy = RetryPolicy()
+        wait = policy.wait_gen(backoff.constant(interval=0))
+        wait.send(None)
+
+        retry_after = _error_response(429, {"Retry-After": "2"})
+        self.assertEqual(wait.send(retry_after.raise_for_status.side_effect), 2)
+        self.assertEqual(wait.send(requests.ConnectionError()), 0)
+
+
+class TestRetries(unittest.TestCase):
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_permanent_errors_are_not_retried(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = _error_response(400)
+
+        ryanair = Ryanair()
+        with self.assertRaises(requests.HTTPError):
+            ryanair.get_cheapest_flights("XXX", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 1)
+
+    @patch("ryanair.ryanair.logger")
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_permanent_errors_are_not_logged_as_given_up(
+        self, mock_get_session, mock_logger
+    ):
+        mock_get_session.return_value.get.return_value = _error_response(400)
+
+        with self.assertRaises(requests.HTTPError):
+            Ryanair().get_cheapest_flights("XXX", "2023-09-01", "2023-09-30")
+
+        mock_logger.exception.assert_not_called()
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_no_circuit_breaker_by_default(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError()
+
+        ryanair = Ryanair()
+        self.assertIsNone(ryanair.retry_policy.circuit_breaker)
+        for airport in ("DUB", "STN", "BGY"):
+            with self.assertRaises(requests.ConnectionError):
+                ryanair.get_cheapest_flights(airport, "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 15)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_invalid_urls_are_not_retried(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = (
+            requests.exceptions.MissingSchema("Invalid URL")
+        )
+
+        ryanair = Ryanair()
+        with self.assertRaises(requests.exceptions.MissingSchema):
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 1)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_malformed_responses_are_not_retried(self, mock_get_session):
+        response = _ok_response()
+        response.content = b"<html>not json</html>"
+        response.json.side_effect = requests.JSONDecodeError("Expecting value", "", 0)
+        mock_get_session.return_value.get.return_value = response
+
+        ryanair = Ryanair()
+        with self.assertRaises(ValueError):
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 1)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_server_errors_are_retried(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = [
+            _error_response(503),
+            _error_response(429, {"Retry-After": "0"}),
+            _ok_response(),
+        ]
+
+        ryanair = Ryanair()
+        self.assertEqual(
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30"), []
+        )
+        self.assertEqual(ryanair.num_queries, 3)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_long_retry_after_is_given_up_on(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = _error_response(
+            429, {"Retry-After": "3600"}
+        )
+
+        ryanair = Ryanair()
+        with self.assertRaises(requests.HTTPError):
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 1)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_max_tries_is_configurable(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError()
+
+        ryanair = Ryanair(retry_policy=RetryPolicy(max_tries=2))
+        with self.assertRaises(requests.ConnectionError):
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 2)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_circuit_breaker_fails_fast_then_recovers(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError()
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=0.05)
+
+        ryanair = Ryanair(
+            retry_policy=RetryPolicy(max_tries=3, circuit_breaker=breaker)
+        )
+        with self.assertRaises(requests.ConnectionError):
+            ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+        self.assertTrue(breaker.is_open)
+        self.assertEqual(ryanair.num_queries, 3)
+
+        with self.assertRaises(CircuitOpenError):
+            ryanair.get_cheapest_flights("STN", "2023-09-01", "2023-09-30")
+        self.assertEqual(ryanair.num_queries, 3)
+
+        time.sleep(0.05)
+        mock_get_session.return_value.get.side_effect = None
+        mock_get_session.return_value.get.return_value = _ok_response()
+        self.assertEqual(
+            ryanair.get_cheapest_flights("STN", "2023-09-01", "2023-09-30"), []
+        )
+        self.assertFalse(breaker.is_open)
+
+    def test_circuit_breaker_lets_one_test_query_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+
+        breaker.before_query()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_query()
+
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+
+    def test_circuit_breaker_test_query_can_be_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+        self.assertFalse(breaker.before_query())
+        breaker.record_failure()
+
+        self.assertTrue(breaker.before_query())
+        breaker.release_test()
+        self.assertTrue(breaker.before_query())
+        self.assertTrue(breaker.is_open)
+
+
+class TestAsyncRetries(unittest.IsolatedAsyncioTestCase):
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_permanent_errors_are_not_retried(self, mock_get_session):
+        request = httpx.Request("GET", "https://example.com")
+        client = Mock()
+        client.get = AsyncMock(return_value=httpx.Response(404, request=request))
+        mock_get_session.return_value = client
+
+        async with AsyncRyanair() as ryanair:
+            with self.assertRaises(httpx.HTTPStatusError):
+                await ryanair.get_cheapest_flights("XXX", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(ryanair.num_queries, 1)
+
+    @patch("ryanair.AsyncSessionManager.AsyncSessionManager.get_session")
+    async def test_cancelled_test_query_releases_circuit_breaker(
+        self, mock_get_session
+    ):
+        started = asyncio.Event()
+
+        async def get(url, params=None):
+            started.set()
+            await asyncio.Event().wait()
+
+        client = Mock()
+        client.get = get
+        mock_get_session.return_value = client
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+
+        async with AsyncRyanair(
+            retry_policy=RetryPolicy(circuit_breaker=breaker)
+        ) as ryanair:
+            task = asyncio.create_task(
+                ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+            )
+            await started.wait()
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_query()
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertTrue(breaker.before_query())
+
+
+if __name__ == "__main__":
+    unittest.main()
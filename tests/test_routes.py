@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ryanair import Ryanair
+from ryanair.routes import RouteGraph
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+
+class TestRouteGraph(unittest.TestCase):
+    def test_adjacency_queries(self):
+        graph = RouteGraph()
+        graph.add_route("DUB", "STN", seen_at=1)
+        graph.add_route("DUB", "BGY", seen_at=2)
+        graph.add_route("ORK", "STN", seen_at=3)
+        graph.add_route("DUB", "STN", seen_at=0)
+
+        self.assertEqual(graph.destinations("DUB"), {"STN", "BGY"})
+        self.assertEqual(graph.origins("STN"), {"DUB", "ORK"})
+        self.assertTrue(graph.has_route("ORK", "STN"))
+        self.assertFalse(graph.has_route("STN", "ORK"))
+        self.assertEqual(
+            graph.filter_destinations("DUB", ["ATH", "BGY", "STN"]), ["BGY", "STN"]
+        )
+        self.assertEqual(graph.last_seen("DUB", "STN"), 1)
+        self.assertEqual(len(graph), 3)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "routes.json")
+            graph = RouteGraph(path)
+            graph.add_route("DUB", "STN")
+            graph.save()
+
+            self.assertEqual(RouteGraph(path).destinations("DUB"), {"STN"})
+
+
+class TestRyanairRouteGraph(unittest.TestCase):
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_routes_are_recorded_from_responses(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        graph = RouteGraph()
+        ryanair_instance = Ryanair(route_graph=graph)
+
+        mock_get.return_value.json.return_value = MOCKED_ONE_WAY_RESPONSE
+        ryanair_instance.get_cheapest_flights(
+            "DUB", "2023-08-23", "2023-08-23", predicate=lambda fare: False
+        )
+        mock_get.return_value.json.return_value = MOCKED_RETURN_RESPONSE
+        ryanair_instance.get_cheapest_return_flights(
+            "DUB", "2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24"
+        )
+
+        self.assertEqual(graph.destinations("DUB"), {"BRS", "EDI", "LBA", "LPL"})
+        self.assertEqual(graph.destinations("LPL"), {"DUB"})
+
+
+if __name__ == "__main__":
+    unittest.main()
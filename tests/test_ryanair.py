@@ -1,4 +1,8 @@
+import copy
 import datetime
+import json
+import threading
+import time
 import unittest
 from unittest import mock
 from unittest.mock import patch, Mock, call
@@ -7,263 +11,8 @@ from unittest.mock import patch, Mock, call
 import requests
 
 from ryanair import Ryanair
-from ryanair.types import Flight, Trip
-
-MOCKED_ONE_WAY_RESPONSE = {
-    "arrivalAirportCategories": None,
-    "fares": [
-        {
-            "outbound": {
-                "departureAirport": {
-                    "countryName": "Ireland",
-                    "iataCode": "DUB",
-                    "name": "Dublin",
-                    "seoName": "dublin",
-                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
-                },
-                "arrivalAirport": {
-                    "countryName": "United Kingdom",
-                    "iataCode": "BRS",
-                    "name": "Bristol",
-                    "seoName": "bristol",
-                    "city": {"name": "Bristol", "code": "BRISTOL", "countryCode": "gb"},
-                },
-                "departureDate": "2023-08-23T08:20:00",
-                "arrivalDate": "2023-08-23T09:30:00",
-                "price": {
-                    "value": 17.68,
-                    "valueMainUnit": "17",
-                    "valueFractionalUnit": "68",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "flightKey": "FR~ 504~ ~~DUB~08/23/2023 08:20~BRS~08/23/2023 09:30~~",
-                "flightNumber": "FR504",
-                "previousPrice": None,
-                "priceUpdated": 1692686097000,
-            },
-            "summary": {
-                "price": {
-                    "value": 17.68,
-                    "valueMainUnit": "17",
-                    "valueFractionalUnit": "68",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "previousPrice": None,
-                "newRoute": False,
-            },
-        },
-        {
-            "outbound": {
-                "departureAirport": {
-                    "countryName": "Ireland",
-                    "iataCode": "DUB",
-                    "name": "Dublin",
-                    "seoName": "dublin",
-                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
-                },
-                "arrivalAirport": {
-                    "countryName": "United Kingdom",
-                    "iataCode": "EDI",
-                    "name": "Edinburgh",
-                    "seoName": "edinburgh",
-                    "city": {
-                        "name": "Edinburgh",
-                        "code": "EDINBURGH",
-                        "countryCode": "gb",
-                    },
-                },
-                "departureDate": "2023-08-23T06:30:00",
-                "arrivalDate": "2023-08-23T07:40:00",
-                "price": {
-                    "value": 17.68,
-                    "valueMainUnit": "17",
-                    "valueFractionalUnit": "68",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "flightKey": "FR~ 812~ ~~DUB~08/23/2023 06:30~EDI~08/23/2023 07:40~~",
-                "flightNumber": "FR812",
-                "previousPrice": None,
-                "priceUpdated": 1692693061000,
-            },
-            "summary": {
-                "price": {
-                    "value": 17.68,
-                    "valueMainUnit": "17",
-                    "valueFractionalUnit": "68",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "previousPrice": None,
-                "newRoute": False,
-            },
-        },
-    ],
-    "nextPage": None,
-    "size": 2,
-}
-
-MOCKED_RETURN_RESPONSE = {
-    "arrivalAirportCategories": None,
-    "fares": [
-        {
-            "outbound": {
-                "departureAirport": {
-                    "countryName": "Ireland",
-                    "iataCode": "DUB",
-                    "name": "Dublin",
-                    "seoName": "dublin",
-                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
-                },
-                "arrivalAirport": {
-                    "countryName": "United Kingdom",
-                    "iataCode": "LBA",
-                    "name": "Leeds Bradford",
-                    "seoName": "leeds",
-                    "city": {"name": "Leeds", "code": "LEEDS", "countryCode": "gb"},
-                },
-                "departureDate": "2023-08-23T06:25:00",
-                "arrivalDate": "2023-08-23T07:30:00",
-                "price": {
-                    "value": 17.59,
-                    "valueMainUnit": "17",
-                    "valueFractionalUnit": "59",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "flightKey": "FR~ 152~ ~~DUB~08/23/2023 06:25~LBA~08/23/2023 07:30~~",
-                "flightNumber": "FR152",
-                "previousPrice": None,
-                "priceUpdated": 1692687660000,
-            },
-            "inbound": {
-                "departureAirport": {
-                    "countryName": "United Kingdom",
-                    "iataCode": "LBA",
-                    "name": "Leeds Bradford",
-                    "seoName": "leeds",
-                    "city": {"name": "Leeds", "code": "LEEDS", "countryCode": "gb"},
-                },
-                "arrivalAirport": {
-                    "countryName": "Ireland",
-                    "iataCode": "DUB",
-                    "name": "Dublin",
-                    "seoName": "dublin",
-                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
-                },
-                "departureDate": "2023-08-24T20:20:00",
-                "arrivalDate": "2023-08-24T21:20:00",
-                "price": {
-                    "value": 18.76,
-                    "valueMainUnit": "18",
-                    "valueFractionalUnit": "76",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "flightKey": "FR~ 456~ ~~LBA~08/24/2023 20:20~DUB~08/24/2023 21:20~~",
-                "flightNumber": "FR456",
-                "previousPrice": None,
-                "priceUpdated": 1692685719000,
-            },
-            "summary": {
-                "price": {
-                    "value": 36.35,
-                    "valueMainUnit": "36",
-                    "valueFractionalUnit": "35",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "previousPrice": None,
-                "newRoute": False,
-                "tripDurationDays": 1,
-            },
-        },
-        {
-            "outbound": {
-                "departureAirport": {
-                    "countryName": "Ireland",
-                    "iataCode": "DUB",
-                    "name": "Dublin",
-                    "seoName": "dublin",
-                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
-                },
-                "arrivalAirport": {
-                    "countryName": "United Kingdom",
-                    "iataCode": "LPL",
-                    "name": "Liverpool",
-                    "seoName": "liverpool",
-                    "city": {
-                        "name": "Liverpool",
-                        "code": "LIVERPOOL",
-                        "countryCode": "gb",
-                    },
-                },
-                "departureDate": "2023-08-23T15:20:00",
-                "arrivalDate": "2023-08-23T16:15:00",
-                "price": {
-                    "value": 20.6,
-                    "valueMainUnit": "20",
-                    "valueFractionalUnit": "60",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "flightKey": "FR~ 448~ ~~DUB~08/23/2023 15:20~LPL~08/23/2023 16:15~~",
-                "flightNumber": "FR448",
-                "previousPrice": None,
-                "priceUpdated": 1692693055000,
-            },
-            "inbound": {
-                "departureAirport": {
-                    "countryName": "United Kingdom",
-                    "iataCode": "LPL",
-                    "name": "Liverpool",
-                    "seoName": "liverpool",
-                    "city": {
-                        "name": "Liverpool",
-                        "code": "LIVERPOOL",
-                        "countryCode": "gb",
-                    },
-                },
-                "arrivalAirport": {
-                    "countryName": "Ireland",
-                    "iataCode": "DUB",
-                    "name": "Dublin",
-                    "seoName": "dublin",
-                    "city": {"name": "Dublin", "code": "DUBLIN", "countryCode": "ie"},
-                },
-                "departureDate": "2023-08-24T21:20:00",
-                "arrivalDate": "2023-08-24T22:15:00",
-                "price": {
-                    "value": 18.51,
-                    "valueMainUnit": "18",
-                    "valueFractionalUnit": "51",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "flightKey": "FR~ 447~ ~~LPL~08/24/2023 21:20~DUB~08/24/2023 22:15~~",
-                "flightNumber": "FR447",
-                "previousPrice": None,
-                "priceUpdated": 1692686981000,
-            },
-            "summary": {
-                "price": {
-                    "value": 39.11,
-                    "valueMainUnit": "39",
-                    "valueFractionalUnit": "11",
-                    "currencyCode": "EUR",
-                    "currencySymbol": "€",
-                },
-                "previousPrice": None,
-                "newRoute": False,
-                "tripDurationDays": 1,
-            },
-        },
-    ],
-    "nextPage": None,
-    "size": 2,
-}
+from ryanair.types import Flight, Trip, FlightTable
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
 
 
 class TestRyanair(unittest.TestCase):
@@ -750,6 +499,334 @@ class TestRyanair(unittest.TestCase):
             any_order=True,
         )
 
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_many(self, mock_get_session):
+        def get(url, params=None):
+            if params["departureAirportIataCode"] == "XXX":
+                raise requests.HTTPError()
+            response = Mock()
+            response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+            return response
+
+        mock_get_session.return_value.get.side_effect = get
+
+        ryanair_instance = Ryanair(max_workers=4)
+        batch = ryanair_instance.get_cheapest_flights_many(
+            ["DUB", "XXX", "STN", "DUB"], "2023-08-23", "2023-08-23", max_price=50
+        )
+
+        self.assertEqual(set(batch.results), {"DUB", "STN"})
+        self.assertEqual(len(batch.results["DUB"]), 2)
+        self.assertEqual(set(batch.errors), {"XXX"})
+        self.assertIsInstance(batch.errors["XXX"], requests.HTTPError)
+        # 1 query each for the successful origins, 5 attempts for the failing one
+        self.assertEqual(ryanair_instance.num_queries, 7)
+        for c in mock_get_session.return_value.get.call_args_list:
+            self.assertEqual(c.kwargs["params"]["priceValueTo"], 50)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_many_is_capped_at_pool_size(self, mock_get_session):
+        in_flight = 0
+        most_in_flight = 0
+        lock = threading.Lock()
+
+        def get(url, params=None):
+            nonlocal in_flight, most_in_flight
+            with lock:
+                in_flight += 1
+                most_in_flight = max(most_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            response = Mock()
+            response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+            return response
+
+        mock_get_session.return_value.get.side_effect = get
+
+        ryanair_instance = Ryanair(max_workers=2)
+        batch = ryanair_instance.get_cheapest_flights_many(
+            [f"A{i:02d}" for i in range(8)], "2023-08-23", "2023-08-23", max_workers=8
+        )
+
+        self.assertEqual(len(batch.results), 8)
+        self.assertLessEqual(most_in_flight, 2)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_return_flights_many(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        batch = ryanair_instance.get_cheapest_return_flights_many(
+            ["DUB", "STN"], "2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24"
+        )
+
+        self.assertEqual(set(batch.results), {"DUB", "STN"})
+        self.assertEqual(batch.errors, {})
+        self.assertEqual(batch.results["STN"][0].totalPrice, 36.35)
+
+    def test_run_many(self):
+        def query(n):
+            if n < 0:
+                raise ValueError(n)
+            return [n] * n
+
+        batch = Ryanair(max_workers=2).run_many(query, [2, -1, 3, 2])
+
+        self.assertEqual(batch.results, {2: [2, 2], 3: [3, 3, 3]})
+        self.assertEqual(set(batch.errors), {-1})
+        self.assertIsInstance(batch.errors[-1], ValueError)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_calendar(self, mock_get_session):
+        # Every window gets the same response, so all but one copy of each flight are duplicates
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        calendar = ryanair_instance.get_cheapest_flights_calendar(
+            "DUB", "2023-08-20", "2023-09-03", window_days=7
+        )
+
+        self.assertEqual(ryanair_instance.num_queries, 3)
+        windows = sorted(
+            (
+                c.kwargs["params"]["outboundDepartureDateFrom"],
+                c.kwargs["params"]["outboundDepartureDateTo"],
+            )
+            for c in mock_get_session.return_value.get.call_args_list
+        )
+        self.assertEqual(
+            windows,
+            [
+                ("2023-08-20", "2023-08-26"),
+                ("2023-08-27", "2023-09-02"),
+                ("2023-09-03", "2023-09-03"),
+            ],
+        )
+        self.assertEqual(set(calendar), {"BRS", "EDI"})
+        self.assertEqual(list(calendar["BRS"]), [datetime.date(2023, 8, 23)])
+        self.assertEqual(len(calendar["BRS"][datetime.date(2023, 8, 23)]), 1)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_return_flights_calendar(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        calendar = ryanair_instance.get_cheapest_return_flights_calendar(
+            "DUB", "2023-08-22", "2023-08-23", "2023-08-24", "2023-08-30"
+        )
+
+        self.assertEqual(ryanair_instance.num_queries, 2)
+        for c in mock_get_session.return_value.get.call_args_list:
+            self.assertEqual(c.kwargs["params"]["inboundDepartureDateTo"], "2023-08-30")
+        self.assertEqual(
+            calendar["LBA"][datetime.date(2023, 8, 23)][0].totalPrice, 36.35
+        )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_calendar_rejects_empty_windows(
+        self, mock_get_session
+    ):
+        ryanair_instance = Ryanair()
+        with self.assertRaises(ValueError):
+            ryanair_instance.get_cheapest_flights_calendar(
+                "DUB", "2023-08-22", "2023-08-23", window_days=0
+            )
+
+        self.assertEqual(ryanair_instance.num_queries, 0)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_calendar_raises_on_error(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.HTTPError()
+
+        ryanair_instance = Ryanair()
+        with self.assertRaises(requests.HTTPError):
+            ryanair_instance.get_cheapest_flights_calendar(
+                "DUB", "2023-08-20", "2023-08-21"
+            )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_iter_cheapest_flights(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        flights = ryanair_instance.iter_cheapest_flights(
+            ["DUB", "STN"],
+            [("2023-08-23", "2023-08-23"), ("2023-08-24", "2023-08-24")],
+            max_workers=2,
+            max_price=50,
+        )
+
+        self.assertEqual(len(list(flights)), 8)
+        self.assertEqual(ryanair_instance.num_queries, 4)
+        queried = sorted(
+            (
+                c.kwargs["params"]["departureAirportIataCode"],
+                c.kwargs["params"]["outboundDepartureDateFrom"],
+            )
+            for c in mock_get_session.return_value.get.call_args_list
+        )
+        self.assertEqual(
+            queried,
+            [
+                ("DUB", "2023-08-23"),
+                ("DUB", "2023-08-24"),
+                ("STN", "2023-08-23"),
+                ("STN", "2023-08-24"),
+            ],
+        )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_iter_cheapest_return_flights_is_lazy(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        trips = ryanair_instance.iter_cheapest_return_flights(
+            ["DUB", "STN", "BGY", "CRL"],
+            [("2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24")],
+            max_workers=1,
+        )
+
+        self.assertEqual(ryanair_instance.num_queries, 0)
+        self.assertEqual(next(trips).totalPrice, 36.35)
+        trips.close()
+        self.assertLess(ryanair_instance.num_queries, 4)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_as_table(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        table = ryanair_instance.get_cheapest_flights(
+            "DUB", "2023-08-23", "2023-08-23", as_table=True
+        )
+
+        self.assertIsInstance(table, FlightTable)
+        self.assertEqual(
+            list(table),
+            ryanair_instance.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23"),
+        )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_retryable_query_parses_raw_content(self, mock_get_session):
+        mock_response = Mock()
+        mock_response.content = json.dumps(MOCKED_ONE_WAY_RESPONSE).encode()
+        mock_get_session.return_value.get.return_value = mock_response
+
+        ryanair_instance = Ryanair()
+        response = ryanair_instance._retryable_query("mock_url")
+
+        self.assertEqual(response, MOCKED_ONE_WAY_RESPONSE)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flights_with_predicate(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        flights = ryanair_instance.get_cheapest_flights(
+            "DUB",
+            "2023-08-23",
+            "2023-08-23",
+            predicate=lambda fare: fare.destination == "EDI"
+            and fare.departureTime.hour < 7,
+        )
+
+        self.assertEqual([flight.flightNumber for flight in flights], ["FR 812"])
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_return_flights_with_predicate(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        trips = ryanair_instance.get_cheapest_return_flights(
+            "DUB",
+            "2023-08-23",
+            "2023-08-23",
+            "2023-08-24",
+            "2023-08-24",
+            predicate=lambda outbound, inbound: outbound.price + inbound.price < 37,
+        )
+
+        self.assertEqual([trip.totalPrice for trip in trips], [36.35])
+        # Airport names are only built once each
+        self.assertIs(trips[0].outbound.originFull, trips[0].inbound.destinationFull)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flexible_return_flights_with_return_queries(
+        self, mock_get_session
+    ):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        result = ryanair_instance.get_cheapest_flexible_return_flights(
+            "DUB", "2023-08-22", "2023-08-23", min_nights=1, max_nights=3
+        )
+
+        self.assertEqual(result.num_queries, 6)
+        self.assertEqual(ryanair_instance.num_queries, 6)
+        # The mocked trips are all one night long
+        self.assertEqual(set(result.trips), {"LBA", "LPL"})
+        self.assertEqual(list(result.trips["LBA"]), [1])
+        self.assertEqual(result.trips["LBA"][1].totalPrice, 36.35)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_flexible_return_flights_with_one_way_queries(
+        self, mock_get_session
+    ):
+        def get(url, params=None):
+            outbound = params["departureAirportIataCode"] == "DUB"
+            day = params["outboundDepartureDateFrom"]
+            flight = copy.deepcopy(MOCKED_RETURN_RESPONSE["fares"][0])[
+                "outbound" if outbound else "inbound"
+            ]
+            flight["departureDate"] = f"{day}T10:00:00"
+            flight["price"]["value"] = (
+                int(day[-2:]) if outbound else 100 - int(day[-2:])
+            )
+            response = Mock()
+            response.json.return_value = {"fares": [{"outbound": flight}]}
+            return response
+
+        mock_get_session.return_value.get.side_effect = get
+
+        ryanair_instance = Ryanair()
+        result = ryanair_instance.get_cheapest_flexible_return_flights(
+            "DUB",
+            "2023-09-01",
+            "2023-09-10",
+            min_nights=3,
+            max_nights=5,
+            destination_airport="LBA",
+        )
+
+        # 10 outbound days and 12 inbound days, rather than 10 days * 3 stay lengths
+        self.assertEqual(result.num_queries, 22)
+        self.assertEqual(ryanair_instance.num_queries, 22)
+        self.assertEqual(set(result.trips["LBA"]), {3, 4, 5})
+        cheapest = result.trips["LBA"][5]
+        self.assertEqual(cheapest.totalPrice, 95)
+        self.assertEqual(
+            (cheapest.inbound.departureTime - cheapest.outbound.departureTime).days, 5
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
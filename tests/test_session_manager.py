@@ -0,0 +1,94 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_server import MockFareServer
+from ryanair import Ryanair
+from ryanair.SessionManager import SessionManager, SessionPool
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.server = MockFareServer(num_fares=2, require_session=True).start()
+        self.patch = self.server.patch_clients()
+        self.patch.__enter__()
+
+    def tearDown(self):
+        self.patch.__exit__(None, None, None)
+        self.server.stop()
+
+    def test_bootstrap_is_lazy(self):
+        ryanair = Ryanair()
+        self.assertEqual(self.server.num_bootstraps, 0)
+
+        flights = ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-01")
+        self.assertEqual(len(flights), 2)
+        ryanair.get_cheapest_flights("STN", "2023-09-01", "2023-09-01")
+        self.assertEqual(self.server.num_bootstraps, 1)
+
+    def test_rejected_sessions_are_refreshed(self):
+        ryanair = Ryanair()
+        ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-01")
+
+        self.server.expire_sessions()
+        flights = ryanair.get_cheapest_flights("STN", "2023-09-01", "2023-09-01")
+
+        self.assertEqual(len(flights), 2)
+        self.assertEqual(self.server.num_bootstraps, 2)
+        self.assertEqual(ryanair.num_queries, 2)
+
+    def test_expired_sessions_are_refreshed(self):
+        ryanair = Ryanair(session_manager=SessionManager(max_age=0.5))
+        ryanair.get_cheapest_flights("DUB", "2023-09-01", "2023-09-01")
+        ryanair.get_cheapest_flights("STN", "2023-09-01", "2023-09-01")
+        self.assertEqual(self.server.num_bootstraps, 1)
+
+        time.sleep(0.5)
+        ryanair.get_cheapest_flights("BGY", "2023-09-01", "2023-09-01")
+        self.assertEqual(self.server.num_bootstraps, 2)
+
+    def test_session_pool_is_warmed_and_shared_between_threads(self):
+        session_pool = SessionPool(size=3)
+        deadline = time.monotonic() + 5
+        while self.server.num_bootstraps < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.num_bootstraps, 3)
+
+        with Ryanair(session_manager=session_pool) as ryanair:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(
+                    executor.map(
+                        lambda i: ryanair.get_cheapest_flights(
+                            f"A{i:02d}", "2023-09-01", "2023-09-01"
+                        ),
+                        range(32),
+                    )
+                )
+
+        self.assertTrue(all(len(flights) == 2 for flights in results))
+        self.assertEqual(self.server.num_bootstraps, 3)
+
+    def test_session_pool_refreshes_in_the_background(self):
+        session_pool = SessionPool(size=2, max_age=0.05, refresh_interval=0.02)
+        deadline = time.monotonic() + 5
+        while self.server.num_bootstraps < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        session_pool.close()
+
+        self.assertGreaterEqual(self.server.num_bootstraps, 4)
+
+    def test_session_pool_only_refreshes_idle_sessions(self):
+        session_pool = SessionPool(size=2, warm=False, refresh_interval=60)
+        with session_pool.checkout() as busy:
+            session_pool._refresh_expiring(0)
+            self.assertEqual(self.server.num_bootstraps, 1)
+            self.assertTrue(busy.expires_within(0))
+
+        session_pool._refresh_expiring(0)
+        self.assertEqual(self.server.num_bootstraps, 2)
+        self.assertFalse(busy.expires_within(0))
+        session_pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
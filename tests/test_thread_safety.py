@@ -0,0 +1,86 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from benchmarks.mock_server import MockFareServer
+from ryanair import Ryanair
+from ryanair.cache import MemoryCache
+from ryanair.SessionManager import SessionPool
+
+NUM_THREADS = 32
+NUM_QUERIES = 400
+NUM_FARES = 3
+
+
+def _dates(num_queries: int) -> list:
+    start = date(2023, 9, 1)
+    return [start + timedelta(days=i) for i in range(num_queries)]
+
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        self.server = MockFareServer(num_fares=NUM_FARES).start()
+        self.patch = self.server.patch_clients()
+        self.patch.__enter__()
+
+    def tearDown(self):
+        self.patch.__exit__(None, None, None)
+        self.server.stop()
+
+    def _query_concurrently(self, ryanair: Ryanair, dates: list) -> list:
+        with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+            return list(
+                executor.map(
+                    lambda day: ryanair.get_cheapest_flights("DUB", day, day), dates
+                )
+            )
+
+    def test_query_counts_are_exact_under_load(self):
+        with Ryanair(max_workers=NUM_THREADS) as ryanair:
+            results = self._query_concurrently(ryanair, _dates(NUM_QUERIES))
+
+        self.assertTrue(all(len(flights) == NUM_FARES for flights in results))
+        self.assertEqual(ryanair.num_queries, NUM_QUERIES)
+        self.assertEqual(self.server.num_requests, NUM_QUERIES)
+        self.assertEqual(self.server.num_bootstraps, 1)
+
+    def test_cache_counts_are_exact_under_load(self):
+        dates = _dates(NUM_QUERIES // 4) * 4
+        with Ryanair(max_workers=NUM_THREADS, cache=MemoryCache()) as ryanair:
+            self._query_concurrently(ryanair, dates)
+
+        self.assertEqual(ryanair.cache_hits + ryanair.cache_misses, NUM_QUERIES)
+        # Misses for a query which was already in flight are coalesced rather than sent
+        self.assertEqual(
+            ryanair.num_queries + ryanair.coalesced_queries, ryanair.cache_misses
+        )
+        self.assertGreaterEqual(ryanair.num_queries, NUM_QUERIES // 4)
+        self.assertEqual(self.server.num_requests, ryanair.num_queries)
+
+    def test_coalesced_counts_are_exact_under_load(self):
+        self.server.latency = 0.05
+        dates = _dates(4) * (NUM_QUERIES // 4)
+        with Ryanair(max_workers=NUM_THREADS) as ryanair:
+            results = self._query_concurrently(ryanair, dates)
+
+        self.assertTrue(all(len(flights) == NUM_FARES for flights in results))
+        self.assertEqual(ryanair.num_queries, self.server.num_requests)
+        self.assertEqual(ryanair.num_queries + ryanair.coalesced_queries, NUM_QUERIES)
+
+    @patch("ryanair.ryanair.logger")
+    def test_currency_mismatches_are_each_logged_under_load(self, mock_logger):
+        with Ryanair(currency="GBP", max_workers=NUM_THREADS) as ryanair:
+            self._query_concurrently(ryanair, _dates(NUM_QUERIES))
+
+        self.assertEqual(mock_logger.warning.call_count, NUM_QUERIES * NUM_FARES)
+
+    def test_session_pool_under_load(self):
+        session_pool = SessionPool(size=8, warm=False)
+        with Ryanair(max_workers=NUM_THREADS, session_manager=session_pool) as ryanair:
+            results = self._query_concurrently(ryanair, _dates(NUM_QUERIES))
+
+        self.assertTrue(all(len(flights) == NUM_FARES for flights in results))
+        self.assertEqual(ryanair.num_queries, NUM_QUERIES)
+        self.assertEqual(self.server.num_requests, NUM_QUERIES)
+        self.assertLessEqual(self.server.num_bootstraps, 8)
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, Mock
+
+from benchmarks.mock_server import MockFareServer
+from ryanair import Ryanair
+from ryanair.SessionManager import BaseSessionManager, SessionManager
+from ryanair.transports import (
+    HttpxSessionManager,
+    MissingRecordingError,
+    RecordingSessionManager,
+    ReplaySessionManager,
+)
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE
+
+try:
+    import h2
+except ImportError:  # pragma: no cover
+    h2 = None
+
+
+class _MockSessionManager(BaseSessionManager):
+    def __init__(self, content: bytes):
+        response = Mock()
+        response.status_code = 200
+        response.content = content
+        response.headers = {"Content-Type": "application/json"}
+        response.json.side_effect = lambda: MOCKED_ONE_WAY_RESPONSE
+        self.session = Mock()
+        self.session.get.return_value = response
+
+    def get_session(self):
+        return self.session
+
+
+class TestTransports(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_session_manager_pool_is_configurable(self):
+        with patch.object(SessionManager, "_update_session_cookie"):
+            session_manager = SessionManager(pool_maxsize=32, pool_block=True)
+
+        adapter = session_manager.get_session().get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter._pool_connections, 32)
+        self.assertTrue(adapter._pool_block)
+
+    def test_session_managers_must_implement_get_session(self):
+        class NoSession(BaseSessionManager):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoSession()
+
+    @patch("ryanair.ryanair.logger")
+    def test_recorded_responses_are_replayed(self, _):
+        content = json.dumps(MOCKED_ONE_WAY_RESPONSE).encode()
+        with Ryanair(
+            session_manager=RecordingSessionManager(
+                self.path, _MockSessionManager(content)
+            )
+        ) as ryanair:
+            recorded = ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+
+        ryanair = Ryanair(session_manager=ReplaySessionManager(self.path))
+        replayed = ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(len(replayed), 2)
+
+        with self.assertRaises(MissingRecordingError):
+            ryanair.get_cheapest_flights("STN", "2023-08-23", "2023-08-23")
+
+    @unittest.skipIf(h2 is None, "HTTP/2 support for httpx isn't installed")
+    def test_httpx_session_manager(self):
+        with MockFareServer(num_fares=3) as server, server.patch_clients():
+            with Ryanair(session_manager=HttpxSessionManager()) as ryanair:
+                flights = ryanair.get_cheapest_flights(
+                    "STN", "2023-08-23", "2023-08-23"
+                )
+                self.assertEqual(ryanair.session.cookies.get("session"), "mock-1")
+
+        self.assertEqual(len(flights), 3)
+        self.assertTrue(all(flight.origin == "STN" for flight in flights))
+
+    def test_httpx_session_manager_bootstraps_lazily(self):
+        with MockFareServer(num_fares=3, require_session=True) as server:
+            with server.patch_clients():
+                with Ryanair(
+                    session_manager=HttpxSessionManager(http2=False)
+                ) as ryanair:
+                    self.assertEqual(server.num_bootstraps, 0)
+                    ryanair.get_cheapest_flights("STN", "2023-08-23", "2023-08-23")
+                    self.assertEqual(server.num_bootstraps, 1)
+
+                    server.expire_sessions()
+                    flights = ryanair.get_cheapest_flights(
+                        "DUB", "2023-08-23", "2023-08-23"
+                    )
+
+        self.assertEqual(len(flights), 3)
+        self.assertEqual(server.num_bootstraps, 2)
+        self.assertEqual(ryanair.num_queries, 2)
+
+    def test_httpx_session_manager_expires_sessions(self):
+        with MockFareServer(num_fares=3) as server, server.patch_clients():
+            with Ryanair(
+                session_manager=HttpxSessionManager(http2=False, max_age=0.5)
+            ) as ryanair:
+                ryanair.get_cheapest_flights("STN", "2023-08-23", "2023-08-23")
+                ryanair.get_cheapest_flights("DUB", "2023-08-23", "2023-08-23")
+                self.assertEqual(server.num_bootstraps, 1)
+
+                time.sleep(0.5)
+                ryanair.get_cheapest_flights("BGY", "2023-08-23", "2023-08-23")
+                self.assertEqual(server.num_bootstraps, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
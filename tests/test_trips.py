@@ -0,0 +1,111 @@
+import datetime
+import random
+import unittest
+
+from ryanair.trips import compose_return_trips
+from ryanair.types import Flight
+
+START = datetime.datetime(2023, 9, 1)
+
+
+def flight(origin, destination, hours, price):
+    return Flight(
+        departureTime=START + datetime.timedelta(hours=hours),
+        flightNumber=f"FR {origin}{destination}{hours}",
+        price=price,
+        currency="EUR",
+        origin=origin,
+        originFull=origin,
+        destination=destination,
+        destinationFull=destination,
+    )
+
+
+class TestComposeReturnTrips(unittest.TestCase):
+    def test_cheapest_inbound_within_stay(self):
+        outbound = [flight("DUB", "STN", 0, 20), flight("DUB", "BGY", 10, 30)]
+        inbound = [
+            flight("STN", "DUB", 12, 5),  # Too short a stay
+            flight("STN", "DUB", 30, 15),
+            flight("STN", "DUB", 40, 12),
+            flight("STN", "DUB", 200, 1),  # Too long a stay
+            flight("STN", "ORK", 30, 2),  # Wrong airport
+            flight("BGY", "DUB", 60, 40),
+        ]
+
+        trips = compose_return_trips(
+            outbound,
+            inbound,
+            min_stay=datetime.timedelta(days=1),
+            max_stay=datetime.timedelta(days=3),
+        )
+
+        self.assertEqual(
+            [(trip.totalPrice, trip.inbound.flightNumber) for trip in trips],
+            [(32, "FR STNDUB40"), (70, "FR BGYDUB60")],
+        )
+
+    def test_open_jaw_and_any_origin(self):
+        outbound = [flight("DUB", "STN", 0, 20)]
+        inbound = [flight("LTN", "ORK", 30, 2), flight("LTN", "DUB", 30, 4)]
+
+        self.assertEqual(compose_return_trips(outbound, inbound), [])
+        self.assertEqual(
+            compose_return_trips(outbound, inbound, open_jaw=True)[0].totalPrice, 24
+        )
+        self.assertEqual(
+            compose_return_trips(
+                outbound, inbound, open_jaw=True, return_to_any_origin=True
+            )[0].totalPrice,
+            22,
+        )
+
+    def test_matches_nested_loop(self):
+        rng = random.Random(0)
+        airports = ["DUB", "STN", "BGY", "ORK"]
+
+        def random_flights(n):
+            flights = []
+            for _ in range(n):
+                origin, destination = rng.sample(airports, 2)
+                flights.append(
+                    flight(
+                        origin,
+                        destination,
+                        rng.randrange(0, 24 * 60),
+                        rng.randrange(5, 100),
+                    )
+                )
+            return flights
+
+        outbound, inbound = random_flights(300), random_flights(300)
+        min_stay, max_stay = datetime.timedelta(days=2), datetime.timedelta(days=5)
+
+        for open_jaw in (False, True):
+            expected = {}
+            for o in outbound:
+                candidates = [
+                    i.price
+                    for i in inbound
+                    if (open_jaw or i.origin == o.destination)
+                    and i.destination == o.origin
+                    and min_stay <= i.departureTime - o.departureTime <= max_stay
+                ]
+                if candidates:
+                    expected[o.flightNumber] = o.price + min(candidates)
+
+            trips = compose_return_trips(
+                outbound, inbound, min_stay, max_stay, open_jaw=open_jaw
+            )
+            self.assertEqual(
+                {trip.outbound.flightNumber: trip.totalPrice for trip in trips},
+                expected,
+            )
+            self.assertEqual(
+                [trip.totalPrice for trip in trips],
+                sorted(trip.totalPrice for trip in trips),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
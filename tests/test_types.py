@@ -0,0 +1,96 @@
+import dataclasses
+import datetime
+import sys
+import unittest
+
+from ryanair.types import Flight, FrozenFlight, FrozenTrip, FlightTable, Trip
+
+FLIGHTS = [
+    Flight(
+        departureTime=datetime.datetime(2023, 8, 23, 8, 20),
+        flightNumber="FR 504",
+        price=17.68,
+        currency="EUR",
+        origin="DUB",
+        originFull="Dublin, Ireland",
+        destination="BRS",
+        destinationFull="Bristol, United Kingdom",
+    ),
+    Flight(
+        departureTime=datetime.datetime(2023, 8, 23, 6, 30),
+        flightNumber="FR 812",
+        price=19.99,
+        currency="EUR",
+        origin="DUB",
+        originFull="Dublin, Ireland",
+        destination="EDI",
+        destinationFull="Edinburgh, United Kingdom",
+    ),
+]
+
+
+class TestTypes(unittest.TestCase):
+    def test_flight_can_be_serialised_with_vars(self):
+        self.assertEqual(vars(FLIGHTS[0])["flightNumber"], "FR 504")
+
+    @unittest.skipIf(sys.version_info < (3, 10), "Slotted dataclasses need 3.10")
+    def test_frozen_flight_has_no_instance_dict(self):
+        self.assertFalse(hasattr(FrozenFlight.from_flight(FLIGHTS[0]), "__dict__"))
+
+    def test_frozen_variants_from_mutable_ones(self):
+        trip = Trip(totalPrice=37.67, outbound=FLIGHTS[0], inbound=FLIGHTS[1])
+        frozen = FrozenTrip.from_trip(trip)
+
+        self.assertEqual(frozen.outbound, FrozenFlight.from_flight(FLIGHTS[0]))
+        self.assertEqual(dataclasses.asdict(frozen), dataclasses.asdict(trip))
+        self.assertIn(frozen, {FrozenTrip.from_trip(trip)})
+
+    def test_frozen_variants_are_hashable(self):
+        outbound = FrozenFlight(**dataclasses.asdict(FLIGHTS[0]))
+        inbound = FrozenFlight(**dataclasses.asdict(FLIGHTS[1]))
+        trip = FrozenTrip(totalPrice=37.67, outbound=outbound, inbound=inbound)
+
+        self.assertEqual(
+            len({outbound, FrozenFlight(**dataclasses.asdict(FLIGHTS[0]))}), 1
+        )
+        self.assertIn(trip, {trip})
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            outbound.price = 1
+
+
+class TestFlightTable(unittest.TestCase):
+    def test_round_trip(self):
+        table = FlightTable(FLIGHTS)
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(list(table), FLIGHTS)
+        self.assertEqual(table[-1], FLIGHTS[1])
+        self.assertEqual(list(table.prices), [17.68, 19.99])
+        self.assertEqual(table.departure_time(1), FLIGHTS[1].departureTime)
+        with self.assertRaises(IndexError):
+            _ = table[2]
+
+    def test_airports_are_stored_once(self):
+        table = FlightTable(FLIGHTS * 100)
+
+        self.assertEqual(len(table), 200)
+        # One currency, one origin and two destinations
+        self.assertEqual(len(table._values), 4)
+        self.assertIs(table[0].originFull, table[199].originFull)
+
+    def test_slicing(self):
+        table = FlightTable(FLIGHTS * 3)
+
+        self.assertIsInstance(table[1:4], FlightTable)
+        self.assertEqual(list(table[1:4]), (FLIGHTS * 3)[1:4])
+        self.assertEqual(list(table[::-2]), (FLIGHTS * 3)[::-2])
+        self.assertEqual(len(table[10:]), 0)
+
+        sliced = table[:1]
+        sliced.append(FLIGHTS[1])
+        self.assertEqual(list(sliced), FLIGHTS)
+        self.assertEqual(len(table), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import copy
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from ryanair import Ryanair
+from ryanair.watch import PriceWatcher
+from tests.fixtures import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+
+def response(fares):
+    mock_response = Mock()
+    mock_response.json.return_value = {"fares": fares}
+    return mock_response
+
+
+@patch("ryanair.SessionManager.SessionManager.get_session")
+class TestPriceWatcher(unittest.TestCase):
+    def test_changes_between_polls(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        brs, edi = copy.deepcopy(MOCKED_ONE_WAY_RESPONSE["fares"])
+        watcher = PriceWatcher(Ryanair(), threshold=1)
+        watcher.watch_flights("dub", "DUB", "2023-08-23", "2023-08-23")
+
+        mock_get.return_value = response([brs])
+        changes = watcher.poll()
+        self.assertEqual(
+            [(c.kind, c.current.destination) for c in changes], [("new", "BRS")]
+        )
+
+        # A small price move, below the threshold
+        brs["outbound"]["price"]["value"] = 18.1
+        mock_get.return_value = response([brs])
+        self.assertEqual(watcher.poll(), [])
+
+        brs["outbound"]["price"]["value"] = 25
+        mock_get.return_value = response([brs, edi])
+        changes = watcher.poll()
+        self.assertEqual(
+            sorted((c.kind, c.query) for c in changes),
+            [("new", "dub"), ("price", "dub")],
+        )
+        price_change = next(c for c in changes if c.kind == "price")
+        self.assertEqual(
+            (price_change.previous.price, price_change.current.price), (17.68, 25)
+        )
+
+        mock_get.return_value = response([edi])
+        changes = watcher.poll()
+        self.assertEqual(
+            [(c.kind, c.previous.destination) for c in changes], [("removed", "BRS")]
+        )
+
+    def test_failed_queries_keep_their_snapshot(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        watcher = PriceWatcher(Ryanair())
+        watcher.watch_return_flights(
+            "dub", "DUB", "2023-08-23", "2023-08-23", "2023-08-24", "2023-08-24"
+        )
+
+        mock_get.return_value = response(MOCKED_RETURN_RESPONSE["fares"])
+        self.assertEqual(len(watcher.poll()), 2)
+
+        mock_get.side_effect = requests.HTTPError()
+        self.assertEqual(watcher.poll(), [])
+
+        mock_get.side_effect = None
+        self.assertEqual(watcher.poll(), [])
+
+    def test_run_until_stopped(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = response(
+            MOCKED_ONE_WAY_RESPONSE["fares"]
+        )
+        watcher = PriceWatcher(Ryanair())
+        watcher.watch_flights("dub", "DUB", "2023-08-23", "2023-08-23")
+        stop_event = threading.Event()
+        received = []
+
+        def callback(changes):
+            received.append(changes)
+            stop_event.set()
+
+        watcher.run(0, callback, stop_event)
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(len(received[0]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()